@@ -6,7 +6,13 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=[
+        'actions.shortcut',
+        'actions.apps',
+        'actions.print_screen',
+        'actions.draw',
+        'actions.quit',
+    ],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
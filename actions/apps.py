@@ -0,0 +1,25 @@
+from overlay_actions import OverlayAction
+from apps_panel import AppsPanel
+
+
+class AppsAction(OverlayAction):
+    def __init__(self, overlay, button):
+        super().__init__(overlay, button)
+        self.panel = None
+
+    def trigger(self):
+        if self.panel is None:
+            self.panel = AppsPanel()
+            self.panel.hide()
+            self.overlay.add_panel(self.panel)
+        self.panel.toggle()
+
+    def collapse(self):
+        if self.panel is not None:
+            self.panel.hide()
+
+    def trim(self):
+        # thumbnails and the window index are rebuilt by the next populate
+        if self.panel is not None and not self.panel.isVisible():
+            self.panel.deleteLater()
+            self.panel = None
@@ -0,0 +1,38 @@
+from overlay_actions import OverlayAction, button_style
+from drawing_window import DrawingWindow
+from screen_manager import ScreenManager
+
+ACTIVE_COLORS = ("#44a", "#55b", "#338", "#006")
+IDLE_COLORS = ("#228", "#33a", "#116", "#006")
+
+
+class DrawAction(OverlayAction):
+    def __init__(self, overlay, button, color_sample_size=1):
+        super().__init__(overlay, button)
+        self.color_sample_size = color_sample_size
+        self.drawing_window = None
+
+    def trigger(self):
+        if self.drawing_window is None or not self.drawing_window.isVisible():
+            # a closed window is kept, reopening shows the same drawing
+            if self.drawing_window is None:
+                self.drawing_window = DrawingWindow(color_sample_size=self.color_sample_size)
+                info = ScreenManager.instance().info_at_cursor()
+                if info:
+                    area = info.available_geometry
+                    self.drawing_window.setGeometry(info.centered(min(800, area.width() - 100), min(600, area.height() - 100)))
+            
+            self.drawing_window.show()
+            self.button.setStyleSheet(button_style(ACTIVE_COLORS))
+        else:
+            self.drawing_window.close()
+            self.button.setStyleSheet(button_style(IDLE_COLORS))
+
+    def attach(self, button):
+        super().attach(button)
+        if self.drawing_window is not None and self.drawing_window.isVisible():
+            button.setStyleSheet(button_style(ACTIVE_COLORS))
+
+    def trim(self):
+        if self.drawing_window is not None:
+            self.drawing_window.trim()
@@ -0,0 +1,18 @@
+from overlay_actions import OverlayAction
+from region_capture import RegionCapture
+
+
+class PrintScreenAction(OverlayAction):
+    def __init__(self, overlay, button, save_dir=None):
+        super().__init__(overlay, button)
+        self.save_dir = save_dir
+        self.region_capture = None
+
+    def trigger(self):
+        self.region_capture = RegionCapture(save_dir=self.save_dir, hide_windows=[self.overlay])
+        self.region_capture.start()
+
+    def trim(self):
+        if self.region_capture is not None and not self.region_capture.isVisible():
+            self.region_capture.deleteLater()
+            self.region_capture = None
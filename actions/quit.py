@@ -0,0 +1,7 @@
+from PyQt5.QtWidgets import QApplication
+from overlay_actions import OverlayAction
+
+
+class QuitAction(OverlayAction):
+    def trigger(self):
+        QApplication.quit()
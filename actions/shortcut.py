@@ -0,0 +1,18 @@
+from overlay_actions import OverlayAction
+from overlay_helper import HelperClient
+
+
+class ShortcutAction(OverlayAction):
+    def __init__(self, overlay, button, key):
+        super().__init__(overlay, button)
+        self.key = key
+
+    def trigger(self):
+        # queued to the helper process, the gui thread does not wait for the
+        # alt+tab delay
+        helper = HelperClient.instance()
+        helper.key_down('alt')
+        helper.press('tab')
+        helper.key_up('alt')
+        helper.sleep(0.1)
+        helper.hotkey('ctrl', self.key.lower())
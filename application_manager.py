@@ -0,0 +1,119 @@
+import math
+from PyQt5.QtCore import QRect
+from overlay_helper import HelperClient
+from screen_manager import ScreenManager
+
+try:
+    import win32gui
+    import win32con
+except ImportError:
+    # only the window layout math is usable without pywin32
+    win32gui = None
+    win32con = None
+
+class ApplicationManager:
+    @staticmethod
+    def get_open_windows():
+        windows = []
+
+        def is_real_window(hwnd):
+            if not win32gui.IsWindowVisible(hwnd):
+                return False
+            if win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE) & win32con.WS_EX_TOOLWINDOW:
+                return False
+            if win32gui.GetWindow(hwnd, win32con.GW_OWNER):
+                return False
+            title = win32gui.GetWindowText(hwnd)
+            if not title.strip():
+                return False
+
+            if "Windows Input Experience" in title or "actionOverlay" in title:
+                return False
+
+            return True
+
+        def callback(hwnd, extra):
+            if is_real_window(hwnd):
+                windows.append((hwnd, win32gui.GetWindowText(hwnd)))
+            return True
+
+        win32gui.EnumWindows(callback, None)
+        return windows
+    
+    @staticmethod
+    def bring_to_current_monitor(hwnd):
+        info = ScreenManager.instance().info_at_cursor()
+        if info:
+            ApplicationManager.move_window_to_screen(hwnd, info)
+
+    @staticmethod
+    def needs_restore(hwnd):
+        return win32gui.IsIconic(hwnd) or win32gui.GetWindowPlacement(hwnd)[1] == win32con.SW_SHOWMAXIMIZED
+
+    @staticmethod
+    def move_window_to_screen(hwnd, info, available=False):
+        rect = info.native_available_geometry if available else info.native_geometry
+        helper = HelperClient.instance()
+        # restore first so the final placement is not overridden by a
+        # minimized/maximized state, then place the window exactly once
+        if ApplicationManager.needs_restore(hwnd):
+            helper.show_window(hwnd, win32con.SW_RESTORE)
+        helper.set_window_pos(hwnd, win32con.HWND_TOP, rect.x(), rect.y(), rect.width(), rect.height(),
+                              win32con.SWP_SHOWWINDOW)
+        helper.set_foreground(hwnd)
+    
+    @staticmethod
+    def close_window(hwnd):
+        HelperClient.instance().post_message(hwnd, win32con.WM_CLOSE)
+
+    @staticmethod
+    def close_windows(hwnds):
+        helper = HelperClient.instance()
+        for hwnd in hwnds:
+            helper.post_message(hwnd, win32con.WM_CLOSE)
+
+    @staticmethod
+    def minimize_windows(hwnds):
+        helper = HelperClient.instance()
+        for hwnd in hwnds:
+            helper.post_message(hwnd, win32con.WM_SYSCOMMAND, win32con.SC_MINIMIZE)
+
+    @staticmethod
+    def tile_rects(count, area):
+        columns = math.ceil(math.sqrt(count))
+        rows = math.ceil(count / columns)
+        rects = []
+        for index in range(count):
+            row, column = divmod(index, columns)
+            # the last row stretches its windows over the full width
+            in_row = columns if row < rows - 1 else count - columns * (rows - 1)
+            width = area.width() // in_row
+            height = area.height() // rows
+            rects.append(QRect(area.x() + column * width, area.y() + row * height, width, height))
+        return rects
+
+    @staticmethod
+    def cascade_rects(count, area, step=32):
+        width = area.width() * 2 // 3
+        height = area.height() * 2 // 3
+        steps = max(1, min((area.width() - width) // step, (area.height() - height) // step))
+        return [QRect(area.x() + (i % steps) * step, area.y() + (i % steps) * step, width, height)
+                for i in range(count)]
+
+    @staticmethod
+    def place_windows(placements):
+        helper = HelperClient.instance()
+        for hwnd, _ in placements:
+            if ApplicationManager.needs_restore(hwnd):
+                helper.show_window(hwnd, win32con.SW_SHOWNOACTIVATE)
+        helper.place_windows(placements, win32con.SWP_NOZORDER | win32con.SWP_NOACTIVATE | win32con.SWP_SHOWWINDOW)
+
+    @staticmethod
+    def tile_windows(hwnds, info):
+        rects = ApplicationManager.tile_rects(len(hwnds), info.native_available_geometry)
+        ApplicationManager.place_windows(list(zip(hwnds, rects)))
+
+    @staticmethod
+    def cascade_windows(hwnds, info):
+        rects = ApplicationManager.cascade_rects(len(hwnds), info.native_available_geometry)
+        ApplicationManager.place_windows(list(zip(hwnds, rects)))
@@ -0,0 +1,281 @@
+from PyQt5.QtCore import Qt, QPoint
+from PyQt5.QtWidgets import QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit
+from PyQt5.QtGui import QPixmap
+from application_manager import ApplicationManager
+from screen_manager import ScreenManager
+from window_thumbnails import ThumbnailLoader
+from window_index import WindowIndex
+
+# rows shown at once, the rest of the matches are reached by filtering
+MAX_ROWS = 15
+
+
+class AppsPanel(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.list_layout = QVBoxLayout()
+        self.list_layout.setContentsMargins(0, 0, 0, 0)
+        self.list_layout.setSpacing(5)
+        self.list_layout.setAlignment(Qt.AlignTop)
+        self.search_box = QLineEdit()
+        self.search_box.setPlaceholderText("type to filter windows")
+        self.search_box.setFixedHeight(36)
+        self.search_box.setClearButtonEnabled(True)
+        self.search_box.setStyleSheet("""
+            QLineEdit {
+                background-color: #222;
+                border-radius: 8px;
+                padding: 2px 6px;
+                border: 1px solid #444;
+                color: white;
+            }
+        """)
+        self.search_box.textChanged.connect(self.render_list)
+        panel_layout = QVBoxLayout(self)
+        panel_layout.setContentsMargins(0, 0, 0, 0)
+        panel_layout.setSpacing(5)
+        panel_layout.setAlignment(Qt.AlignTop)
+        panel_layout.addWidget(self.search_box)
+        panel_layout.addLayout(self.list_layout)
+
+        batch_layout = QHBoxLayout()
+        batch_layout.setSpacing(5)
+        self.batch_buttons = []
+        for text, tooltip, color, hover, action in (
+            ("✕ close", "Close the ✓ selected windows", "#922", "#b33", self.batch_close),
+            ("▁ minimize", "Minimize the ✓ selected windows", "#2c2c2c", "#3a3a3a", self.batch_minimize),
+            ("▦ tile", "Tile the selected (or all listed) windows on this screen", "#286", "#3a8", self.batch_tile),
+            ("❐ cascade", "Cascade the selected (or all listed) windows on this screen", "#228", "#33a", self.batch_cascade),
+        ):
+            btn = QPushButton(text)
+            btn.setFixedHeight(32)
+            btn.setToolTip(tooltip)
+            btn.setStyleSheet(f"""
+                QPushButton {{
+                    background-color: {color};
+                    color: white;
+                    border: none;
+                    border-radius: 5px;
+                }}
+                QPushButton:hover {{
+                    background-color: {hover};
+                }}
+                QPushButton:disabled {{
+                    background-color: #2c2c2c;
+                    color: #807d7d;
+                }}
+            """)
+            btn.clicked.connect(action)
+            batch_layout.addWidget(btn)
+            self.batch_buttons.append(btn)
+        # closing and minimizing never fall back to "everything listed"
+        self.close_all_button, self.minimize_all_button = self.batch_buttons[:2]
+        panel_layout.addLayout(batch_layout)
+        self.setFixedWidth(370)
+
+        self.window_index = WindowIndex()
+        self.selected_windows = set()
+        self.listed_windows = []
+
+        self.thumbnail_loader = ThumbnailLoader(parent=self)
+        self.thumbnail_loader.thumbnail_ready.connect(self.set_app_thumbnail)
+        self.thumbnail_labels = {}
+        self.update_batch_buttons()
+
+    def toggle(self):
+        if self.isVisible():
+            self.hide()
+        else:
+            self.populate()
+            self.show()
+        self.window().adjustSize()
+
+    def populate(self):
+        # the index only re-tokenizes windows that appeared or changed title
+        self.window_index.update(ApplicationManager.get_open_windows())
+        self.selected_windows &= set(self.window_index.titles)
+        self.render_list(self.search_box.text())
+
+    def render_list(self, query=""):
+        for i in reversed(range(self.list_layout.count())): 
+            widget = self.list_layout.itemAt(i).widget()
+            if widget:
+                widget.setParent(None)
+            else:
+                layout = self.list_layout.itemAt(i).layout()
+                if layout:
+                    for j in reversed(range(layout.count())):
+                        layout.itemAt(j).widget().setParent(None)
+                    self.list_layout.removeItem(layout)
+        
+        # one more than fits tells whether to show the "more" hint; with a
+        # limit the index skips the subsequence scan once substring matches
+        # fill the list
+        matches = self.window_index.search(query, limit=MAX_ROWS + 1)
+        self.thumbnail_labels = {}
+        # only the rows on screen, batch actions never reach windows the
+        # user cannot see
+        self.listed_windows = [h for h in matches[:MAX_ROWS] if "Task Manager" not in self.window_index.titles[h]]
+        
+        for hwnd in matches[:MAX_ROWS]:
+            title = self.window_index.titles[hwnd]
+            window_layout = QHBoxLayout()
+            window_layout.setSpacing(5)
+
+            select_btn = QPushButton("✓")
+            select_btn.setFixedSize(24, 40)
+            select_btn.setCheckable(True)
+            select_btn.setChecked(hwnd in self.selected_windows)
+            select_btn.setEnabled("Task Manager" not in title)
+            select_btn.setToolTip("Select for batch actions")
+            select_btn.setStyleSheet("""
+                QPushButton {
+                    background-color: #222;
+                    color: #444;
+                    border: 1px solid #444;
+                    border-radius: 5px;
+                }
+                QPushButton:checked {
+                    color: white;
+                    border: 1px solid #2196F3;
+                    background-color: #2196F3;
+                }
+            """)
+            select_btn.toggled.connect(lambda checked, h=hwnd: self.select_window(h, checked))
+            window_layout.addWidget(select_btn)
+
+            thumbnail = QLabel()
+            thumbnail.setFixedSize(64, 40)
+            thumbnail.setAlignment(Qt.AlignCenter)
+            thumbnail.setStyleSheet("""
+                background-color: #111;
+                border-radius: 4px;
+                border: 1px solid #444;
+            """)
+            self.thumbnail_labels[hwnd] = thumbnail
+            cached = self.thumbnail_loader.request(hwnd)
+            if cached is not None:
+                thumbnail.setPixmap(QPixmap.fromImage(cached))
+            window_layout.addWidget(thumbnail)
+            
+            short_title = title[:24] + "..." if len(title) > 24 else title
+            label = QLabel(short_title)
+            label.setStyleSheet("""
+                background-color: #222;
+                border-radius: 8px;
+                padding: 2px 6px;
+                border: 1px solid #444;
+                color: white;
+            """)
+            label.setFixedSize(150, 40)
+            window_layout.addWidget(label)
+            
+            if "Task Manager" not in title:
+                bring_btn = QPushButton("⇲")
+                bring_btn.setFixedSize(40, 40)
+                bring_btn.setStyleSheet("""
+                    QPushButton {
+                        background-color: #286;
+                        color: white;
+                        border: none;
+                        border-radius: 5px;
+                    }
+                    QPushButton:hover {
+                        background-color: #3a8;
+                    }
+                """)
+                bring_btn.clicked.connect(lambda _, h=hwnd: (self.window_index.touch(h), ApplicationManager.bring_to_current_monitor(h), self.hide()))
+                window_layout.addWidget(bring_btn)
+
+            
+            if "Task Manager" not in title:
+                close_btn = QPushButton("✕")
+                close_btn.setFixedSize(40, 40)
+                close_btn.setStyleSheet("""
+                    QPushButton {
+                        background-color: #922;
+                        color: white;
+                        border: none;
+                        border-radius: 5px;
+                    }
+                    QPushButton:hover {
+                        background-color: #b33;
+                    }
+                """)
+                close_btn.clicked.connect(lambda _, h=hwnd: (ApplicationManager.close_windows([h]), self.hide()))
+                window_layout.addWidget(close_btn)
+            else:
+                disabled_btn = QPushButton("No permission")
+                disabled_btn.setFixedSize(110, 40)
+                disabled_btn.setStyleSheet("""
+                    QPushButton {
+                        background-color: #2c2c2c;
+                        padding: 0px;
+                        color: #807d7d;
+                        border: 1px solid #444;
+                        border-radius: 10px;
+                        text-align: center;
+                    }
+                    QPushButton:hover {
+                        background-color: #2c2c2c;
+                    }
+                """)
+                window_layout.addWidget(disabled_btn)
+            
+            self.list_layout.addLayout(window_layout)
+
+        if len(matches) > MAX_ROWS:
+            more_label = QLabel("more windows match, type to filter")
+            more_label.setStyleSheet("color: #807d7d; padding: 2px 6px;")
+            self.list_layout.addWidget(more_label)
+        self.update_batch_buttons()
+        self.window().adjustSize()
+
+    def select_window(self, hwnd, selected):
+        if selected:
+            self.selected_windows.add(hwnd)
+        else:
+            self.selected_windows.discard(hwnd)
+        self.update_batch_buttons()
+
+    def update_batch_buttons(self):
+        selected = bool(self.batch_targets(selected_only=True))
+        self.close_all_button.setEnabled(selected)
+        self.minimize_all_button.setEnabled(selected)
+
+    def batch_targets(self, selected_only=False):
+        # with nothing selected tile and cascade apply to the listed rows,
+        # close and minimize need an explicit selection; either way only rows
+        # that are on screen are acted on
+        selected = [h for h in self.listed_windows if h in self.selected_windows]
+        if selected or selected_only:
+            return selected
+        return list(self.listed_windows)
+
+    def run_batch(self, action, selected_only=False):
+        hwnds = self.batch_targets(selected_only)
+        if not hwnds:
+            return
+        action(hwnds)
+        self.selected_windows.clear()
+        self.update_batch_buttons()
+        self.hide()
+
+    def batch_close(self):
+        self.run_batch(ApplicationManager.close_windows, selected_only=True)
+
+    def batch_minimize(self):
+        self.run_batch(ApplicationManager.minimize_windows, selected_only=True)
+
+    def batch_tile(self):
+        info = ScreenManager.instance().info_at(self.mapToGlobal(QPoint(0, 0)))
+        self.run_batch(lambda hwnds: ApplicationManager.tile_windows(hwnds, info))
+
+    def batch_cascade(self):
+        info = ScreenManager.instance().info_at(self.mapToGlobal(QPoint(0, 0)))
+        self.run_batch(lambda hwnds: ApplicationManager.cascade_windows(hwnds, info))
+
+    def set_app_thumbnail(self, hwnd, image):
+        label = self.thumbnail_labels.get(hwnd)
+        if label is not None:
+            label.setPixmap(QPixmap.fromImage(image))
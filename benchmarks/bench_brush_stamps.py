@@ -0,0 +1,75 @@
+import os
+import sys
+import math
+import random
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import Qt, QPointF
+from PyQt5.QtGui import QGuiApplication, QPainter, QPen, QColor, QPixmap
+from brush_stamps import BrushStampCache, stamp_segment
+
+
+def make_stroke(count, width, height, seed=7):
+    rng = random.Random(seed)
+    x, y = width / 2, height / 2
+    points = []
+    for i in range(count):
+        x = min(max(x + rng.uniform(-12, 12), 0), width)
+        y = min(max(y + rng.uniform(-12, 12), 0), height)
+        # taper between 2 and 30 px like a pressure stroke would
+        points.append((QPointF(x, y), 16 + 14 * math.sin(i / 15)))
+    return points
+
+
+def bench_pen(pixmap, points, color):
+    pen = QPen(color, 1, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+    start = time.perf_counter()
+    for (a, wa), (b, wb) in zip(points, points[1:]):
+        painter = QPainter(pixmap)
+        pen.setWidthF((wa + wb) / 2)
+        painter.setPen(pen)
+        painter.drawLine(a, b)
+        painter.end()
+    return time.perf_counter() - start
+
+
+def bench_stamps(pixmap, points, color, cache):
+    start = time.perf_counter()
+    first = True
+    for (a, wa), (b, wb) in zip(points, points[1:]):
+        painter = QPainter(pixmap)
+        stamp_segment(painter, cache, a, b, wa, wb, color, first)
+        first = False
+        painter.end()
+    return time.perf_counter() - start
+
+
+def main():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QGuiApplication(sys.argv)
+    segments = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    points = make_stroke(segments + 1, 1920, 1080)
+    color = QColor("#F44336")
+
+    pixmap = QPixmap(1920, 1080)
+    pixmap.fill(Qt.transparent)
+    pen_time = bench_pen(pixmap, points, color)
+
+    cache = BrushStampCache()
+    pixmap.fill(Qt.transparent)
+    cold_time = bench_stamps(pixmap, points, color, cache)
+    pixmap.fill(Qt.transparent)
+    warm_time = bench_stamps(pixmap, points, color, cache)
+
+    print(f"segments:             {segments}")
+    print(f"QPen width per seg:   {segments / pen_time:10.0f} seg/s")
+    print(f"stamps (cold cache):  {segments / cold_time:10.0f} seg/s")
+    print(f"stamps (warm cache):  {segments / warm_time:10.0f} seg/s")
+    print(f"cached stamps:        {len(cache)}")
+    del app
+
+
+if __name__ == "__main__":
+    main()
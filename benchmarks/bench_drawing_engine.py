@@ -0,0 +1,75 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QColor
+from drawing_engine import DrawingEngine, ensure_app
+from bench_brush_stamps import make_stroke
+
+
+def pixel_fill(image, x, y, target_color, fill_color):
+    # the per-pixel fill the draw window used before the engine, for comparison
+    width = image.width()
+    height = image.height()
+    stack = [(x, y)]
+    visited = set()
+    while stack:
+        cx, cy = stack.pop()
+        if (cx, cy) in visited:
+            continue
+        if cx < 0 or cy < 0 or cx >= width or cy >= height:
+            continue
+        if image.pixelColor(cx, cy) != target_color:
+            continue
+        image.setPixelColor(cx, cy, fill_color)
+        visited.add((cx, cy))
+        stack.extend([(cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)])
+
+
+def main():
+    app = ensure_app()
+    segments = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    points = make_stroke(segments + 1, 1920, 1080)
+    engine = DrawingEngine(size=QSize(1920, 1080))
+    engine.set_tool(color="#F44336")
+
+    start = time.perf_counter()
+    engine.stroke([p for p, _ in points], widths=[w for _, w in points])
+    single_time = time.perf_counter() - start
+
+    engine.clear()
+    operations = [{"op": "stroke", "points": [(p.x(), p.y()) for p, _ in points[i:i + 51]],
+                   "widths": [w for _, w in points[i:i + 51]]} for i in range(0, segments, 50)]
+    start = time.perf_counter()
+    engine.apply(operations)
+    batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.render()
+    render_time = time.perf_counter() - start
+
+    engine.clear()
+    engine.set_tool(color="#00BCD4")
+    engine.shape("ellipse", (200, 150), (1000, 750), 6)
+    image = engine.layer().image.copy()
+    start = time.perf_counter()
+    engine.fill(600, 450)
+    fill_time = time.perf_counter() - start
+    start = time.perf_counter()
+    pixel_fill(image, 600, 450, image.pixelColor(600, 450), QColor("#00BCD4"))
+    pixel_fill_time = time.perf_counter() - start
+
+    print(f"segments:               {segments}")
+    print(f"stroke (op per call):   {segments / single_time:10.0f} seg/s")
+    print(f"stroke (apply batch):   {segments / batch_time:10.0f} seg/s")
+    print(f"render 1920x1080:       {render_time * 1000:10.1f} ms")
+    print(f"fill 800x600 ellipse:   {fill_time * 1000:10.1f} ms")
+    print(f"  per-pixel (old) fill: {pixel_fill_time * 1000:10.1f} ms")
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from overlay_helper import HelperClient, OP_NOOP
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    client = HelperClient()
+    client.start()
+    # first ping waits for the helper process to start
+    startup = client.ping(timeout=10.0)
+    if startup is None:
+        print("helper did not answer")
+        return
+    if client.in_process:
+        print("helper process could not be started, measuring the in-process fallback")
+
+    samples = []
+    for _ in range(count):
+        rtt = client.ping()
+        if rtt is not None:
+            samples.append(rtt * 1e6)
+    samples.sort()
+
+    start = time.perf_counter()
+    for _ in range(count):
+        client.send(OP_NOOP)
+    enqueue = time.perf_counter() - start
+    client.ping(timeout=10.0)
+    drained = time.perf_counter() - start
+
+    print(f"helper startup:         {startup * 1000:8.1f} ms")
+    print(f"ping round trips:       {len(samples)}/{count}")
+    print(f"round trip median:      {statistics.median(samples):8.1f} us")
+    print(f"round trip p99:         {samples[int(len(samples) * 0.99) - 1]:8.1f} us")
+    print(f"fire-and-forget send:   {enqueue / count * 1e6:8.2f} us per command on the caller")
+    print(f"pipelined throughput:   {count / drained:8.0f} commands/s")
+
+    client._process.kill()
+    client._process.wait()
+    rtt = client.ping(timeout=10.0)
+    print(f"after helper kill:      restarts={client.restarts} first ping {rtt * 1000 if rtt else float('nan'):.1f} ms")
+    client.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import time
+import ctypes
+import importlib.util
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from actionOverlay import OverlayButton
+from bench_brush_stamps import make_stroke
+
+
+def resident_bytes():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    if sys.platform == "win32":
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", ctypes.c_ulong), ("PageFaultCount", ctypes.c_ulong)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb)
+        return counters.WorkingSetSize
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def settle(app):
+    for _ in range(5):
+        app.processEvents()
+        time.sleep(0.02)
+
+
+def click(overlay, name):
+    for entry, button in zip(overlay.action_entries, overlay.action_buttons):
+        if entry.name == name:
+            button.click()
+            return entry.action
+
+
+def main():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(sys.argv)
+    overlay = OverlayButton()
+    overlay.show()
+    settle(app)
+    start_rss = resident_bytes()
+
+    overlay.toggle_buttons()
+    if importlib.util.find_spec("win32gui") is not None:
+        click(overlay, "apps")
+    else:
+        print("apps panel skipped, pywin32 is not installed")
+    draw = click(overlay, "draw")
+    # the draw window covers the available area of the screen it opens on
+    window = draw.drawing_window
+    settle(app)
+    points = make_stroke(2001, window.canvas.size().width(), window.canvas.size().height())
+    window.engine.stroke([p for p, _ in points], widths=[w for _, w in points])
+    window.refresh_canvas()
+    drawing = window.canvas.to_image()
+    click(overlay, "draw")
+    overlay.toggle_buttons()
+    settle(app)
+    busy_rss = resident_bytes()
+
+    start = time.perf_counter()
+    overlay.trim_resources()
+    trim_time = time.perf_counter() - start
+    settle(app)
+    trimmed_rss = resident_bytes()
+
+    start = time.perf_counter()
+    overlay.toggle_buttons()
+    click(overlay, "draw")
+    app.processEvents()
+    restore_time = time.perf_counter() - start
+    restored = window.canvas.to_image() == drawing
+    settle(app)
+    restored_rss = resident_bytes()
+
+    mb = 1024 * 1024
+    print(f"canvas:                 {window.canvas.size().width()}x{window.canvas.size().height()}")
+    print(f"rss after startup:      {start_rss / mb:8.1f} MB")
+    print(f"rss expanded, drawn:    {busy_rss / mb:8.1f} MB")
+    print(f"rss after idle trim:    {trimmed_rss / mb:8.1f} MB  (trim took {trim_time * 1000:.1f} ms)")
+    print(f"rss after reopening:    {restored_rss / mb:8.1f} MB  (restore took {restore_time * 1000:.1f} ms)")
+    print(f"drawing restored:       {restored}")
+    window.close()
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+import os
+import sys
+import time
+import tempfile
+import statistics
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import Qt, QPoint
+from PyQt5.QtTest import QTest
+from PyQt5.QtWidgets import QApplication
+from region_capture import RegionCapture
+
+
+def capture_once(app, settle_ms, save_dir):
+    capture = RegionCapture(copy_to_clipboard=True, save_dir=save_dir, settle_ms=settle_ms)
+    done = []
+    capture.captured.connect(done.append)
+    capture.start()
+    app.processEvents()
+    QTest.mousePress(capture, Qt.LeftButton, Qt.NoModifier, QPoint(100, 100))
+    QTest.mouseMove(capture, QPoint(500, 400))
+    QTest.mouseRelease(capture, Qt.LeftButton, Qt.NoModifier, QPoint(500, 400))
+    while not done:
+        app.processEvents()
+        time.sleep(0.001)
+    return capture.last_latency_ms, capture.last_file_path
+
+
+def main():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication(sys.argv)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    save_dir = tempfile.mkdtemp(prefix="region_capture_")
+    results = {}
+    # settle_ms is the wait for the selection overlay to disappear from
+    # the screen before it is grabbed
+    for settle_ms in (30, 0):
+        samples = []
+        paths = set()
+        for _ in range(count):
+            latency, path = capture_once(app, settle_ms, save_dir)
+            samples.append(latency)
+            paths.add(path)
+        results[settle_ms] = (samples, len(paths))
+
+    print(f"captures per setting:   {count} (400x300 region, clipboard and png)")
+    for settle_ms, (samples, unique) in results.items():
+        print(f"release to image, settle {settle_ms:2d} ms: median {statistics.median(samples):6.1f} ms,"
+              f" max {max(samples):6.1f} ms, {unique} distinct files")
+    del app
+
+
+if __name__ == "__main__":
+    main()
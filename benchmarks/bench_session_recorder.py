@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QGuiApplication, QColor
+from canvas_layers import LayeredCanvas
+from drawing_engine import DrawingEngine
+from session_recorder import SessionRecorder, SessionPlayer
+from bench_brush_stamps import make_stroke
+
+# pointer events of a typical mouse / pen arrive every ~8 ms
+EVENT_INTERVAL_MS = 8
+
+
+def main():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QGuiApplication(sys.argv)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    points = make_stroke(count + 1, 1920, 1080)
+    color = QColor("#F44336")
+    canvas = LayeredCanvas(QSize(1920, 1080))
+
+    engine = DrawingEngine(canvas)
+    engine.set_tool(color=color)
+    start = time.perf_counter()
+    first = True
+    for (a, wa), (b, wb) in zip(points, points[1:]):
+        engine.draw_line(a, b, wa, wb, first=first)
+        first = False
+    draw_time = time.perf_counter() - start
+
+    canvas.clear()
+    recorder = SessionRecorder(canvas)
+    header = len(recorder.buffer)
+    recorder.stroke_begin(points[0][0], points[0][1], color, False, canvas.active_index)
+    start = time.perf_counter()
+    for point, width in points[1:]:
+        recorder.stroke_point(point, width)
+    record_time = time.perf_counter() - start
+    recorder.stroke_end()
+    data = recorder.data()
+
+    start = time.perf_counter()
+    player = SessionPlayer(data)
+    decode_time = time.perf_counter() - start
+    start = time.perf_counter()
+    player.advance(player.duration)
+    replay_time = time.perf_counter() - start
+
+    print(f"stroke points:          {count}")
+    print(f"draw per point:         {draw_time / count * 1e6:8.1f} us")
+    print(f"record per point:       {record_time / count * 1e6:8.1f} us"
+          f"  ({record_time / draw_time * 100:.1f}% of drawing)")
+    print(f"session size:           {len(data)} bytes ({(len(data) - header) / count:.2f} bytes/point)")
+    print(f"decode:                 {decode_time * 1000:8.1f} ms")
+    print(f"replay:                 {count / replay_time:8.0f} points/s"
+          f"  (~{count * EVENT_INTERVAL_MS / 1000 / replay_time:.0f}x real time at {EVENT_INTERVAL_MS} ms/event)")
+    del app
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+import math
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QPointF
+from PyQt5.QtGui import QPainter, QColor, QImage
+
+
+class BrushStampCache:
+    # radius is quantized to half pixels so a stroke that tapers smoothly
+    # still reuses a small set of stamps
+    RADIUS_STEPS = 2
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._stamps = OrderedDict()
+
+    def quantize(self, radius):
+        return max(1, int(round(radius * self.RADIUS_STEPS)))
+
+    def get(self, radius, color):
+        color = QColor(color)
+        return self.stamp(self.quantize(radius), color.rgba(), color)
+
+    def stamp(self, step, rgba, color):
+        # step is an already quantized radius and rgba the color's key, so a
+        # hit builds no Qt objects
+        key = (step, rgba)
+        stamp = self._stamps.get(key)
+        if stamp is not None:
+            self._stamps.move_to_end(key)
+            return stamp
+        stamp = self._render(step / self.RADIUS_STEPS, color)
+        self._stamps[key] = stamp
+        if len(self._stamps) > self.max_entries:
+            self._stamps.popitem(last=False)
+        return stamp
+
+    def clear(self):
+        self._stamps.clear()
+
+    def __len__(self):
+        return len(self._stamps)
+
+    def _render(self, radius, color):
+        # QImage rather than QPixmap, so headless engines need no
+        # QGuiApplication
+        size = int(math.ceil(radius * 2)) + 2
+        stamp = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+        stamp.fill(Qt.transparent)
+        painter = QPainter(stamp)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(color)
+        painter.drawEllipse(QPointF(size / 2, size / 2), radius, radius)
+        painter.end()
+        return stamp
+
+
+class PenDynamics:
+    # width multipliers are clamped to [min_ratio, 1] so a fast flick or a
+    # light touch never makes the line disappear
+    def __init__(self, min_ratio=0.3, max_velocity=3.0, smoothing=0.4):
+        self.min_ratio = min_ratio
+        self.max_velocity = max_velocity
+        self.smoothing = smoothing
+        self._last_pos = None
+        self._last_time = None
+        self._ratio = 1.0
+
+    def begin(self, pos, timestamp, pressure=None):
+        self._last_pos = QPointF(pos)
+        self._last_time = timestamp
+        if pressure is not None:
+            self._ratio = self._pressure_ratio(pressure)
+        else:
+            self._ratio = 1.0
+        return self._ratio
+
+    def update(self, pos, timestamp, pressure=None):
+        pos = QPointF(pos)
+        if pressure is not None:
+            target = self._pressure_ratio(pressure)
+        else:
+            target = self._velocity_ratio(pos, timestamp)
+        self._ratio += (target - self._ratio) * self.smoothing
+        self._last_pos = pos
+        self._last_time = timestamp
+        return self._ratio
+
+    def _pressure_ratio(self, pressure):
+        pressure = min(max(pressure, 0.0), 1.0)
+        return self.min_ratio + (1.0 - self.min_ratio) * pressure
+
+    def _velocity_ratio(self, pos, timestamp):
+        if self._last_pos is None or self._last_time is None:
+            return self._ratio
+        elapsed = max(timestamp - self._last_time, 1)
+        delta = pos - self._last_pos
+        velocity = math.hypot(delta.x(), delta.y()) / elapsed
+        ratio = 1.0 - (1.0 - self.min_ratio) * min(velocity / self.max_velocity, 1.0)
+        return ratio
+
+
+def stamp_segment(painter, cache, from_point, to_point, from_width, to_width, color, include_start=True):
+    # the color key and stamp lookups are resolved once per radius step and
+    # stamps are drawn at whole pixels (the raster engine rounds a QPointF
+    # the same way), so the loop allocates nothing
+    color = QColor(color)
+    rgba = color.rgba()
+    x, y = from_point.x(), from_point.y()
+    dx = to_point.x() - x
+    dy = to_point.y() - y
+    distance = math.hypot(dx, dy)
+    spacing = max(1.0, min(from_width, to_width) * 0.25)
+    steps = max(1, int(distance / spacing))
+    radius_steps = cache.RADIUS_STEPS / 2
+    draw = painter.drawImage
+    floor = math.floor
+    last_step = None
+    for i in range(0 if include_start else 1, steps + 1):
+        t = i / steps
+        step = max(1, int(round((from_width + (to_width - from_width) * t) * radius_steps)))
+        if step != last_step:
+            last_step = step
+            stamp = cache.stamp(step, rgba, color)
+            half = stamp.width() / 2 - 0.5
+        draw(floor(x + dx * t - half), floor(y + dy * t - half), stamp)
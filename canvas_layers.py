@@ -0,0 +1,219 @@
+import os
+import sys
+import zlib
+import tempfile
+import weakref
+from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtGui import QPainter, QImage, QPixmap, QRegion
+
+
+class Layer:
+    def __init__(self, name, size, opacity=1.0, visible=True):
+        self.name = name
+        self.opacity = opacity
+        self.visible = visible
+        self.image = QImage(size, QImage.Format_ARGB32_Premultiplied)
+        self.image.fill(Qt.transparent)
+
+    def resize(self, size):
+        if self.image.size() == size:
+            return
+        image = QImage(size, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.drawImage(0, 0, self.image)
+        painter.end()
+        self.image = image
+
+
+def blank_image(size):
+    image = QImage(size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    return image
+
+
+def remove_spill_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class LayeredCanvas:
+    DEFAULT_LAYERS = (
+        ("background", 1.0),
+        ("highlighter", 0.45),
+        ("ink", 1.0),
+    )
+
+    def __init__(self, size=QSize(1, 1), layers=DEFAULT_LAYERS, headless=False):
+        self.layers = [Layer(name, size, opacity) for name, opacity in layers]
+        self.active_index = len(self.layers) - 1
+        # a window paints the composite as a QPixmap; headless canvases keep
+        # it as a QImage, which needs no QGuiApplication
+        self.headless = headless
+        self.pixmap = self._new_composite(size)
+        self._dirty = QRegion()
+        self._spilled = None
+        self._spill_cleanup = None
+
+    def _new_composite(self, size):
+        if self.headless:
+            composite = QImage(size, QImage.Format_ARGB32_Premultiplied)
+        else:
+            composite = QPixmap(size)
+        composite.fill(Qt.transparent)
+        return composite
+
+    def size(self):
+        if self._spilled is not None:
+            return self._spilled[0]
+        return self.pixmap.size()
+
+    def rect(self):
+        return self.pixmap.rect()
+
+    def layer(self, name):
+        self.restore()
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        return None
+
+    def active_layer(self):
+        self.restore()
+        return self.layers[self.active_index]
+
+    def set_active(self, name):
+        for index, layer in enumerate(self.layers):
+            if layer.name == name:
+                self.active_index = index
+                return layer
+        return None
+
+    def set_visible(self, name, visible):
+        layer = self.layer(name)
+        if layer is not None and layer.visible != visible:
+            layer.visible = visible
+            self.mark_dirty()
+
+    def set_opacity(self, name, opacity):
+        layer = self.layer(name)
+        if layer is not None and layer.opacity != opacity:
+            layer.opacity = opacity
+            self.mark_dirty()
+
+    def resize(self, size):
+        self.restore()
+        if self.pixmap.size() == size:
+            return
+        for layer in self.layers:
+            layer.resize(size)
+        self.pixmap = self._new_composite(size)
+        self._dirty = QRegion(self.rect())
+
+    def clear(self, name=None):
+        self.restore()
+        for layer in self.layers:
+            if name is None or layer.name == name:
+                layer.image.fill(Qt.transparent)
+        self.mark_dirty()
+
+    def mark_dirty(self, rect=None):
+        if rect is None:
+            rect = self.rect()
+        self._dirty = self._dirty.united(rect.intersected(self.rect()))
+
+    def is_dirty(self):
+        return not self._dirty.isEmpty()
+
+    def compose(self):
+        # only the dirty rectangles are recomposed, the rest of the cached
+        # composite is left untouched
+        if self._dirty.isEmpty() or self._spilled is not None:
+            return QRegion()
+        dirty = self._dirty
+        self._dirty = QRegion()
+        painter = QPainter(self.pixmap)
+        for rect in dirty.rects():
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.fillRect(rect, Qt.transparent)
+            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+            for layer in self.layers:
+                if layer.visible and layer.opacity > 0:
+                    painter.setOpacity(layer.opacity)
+                    painter.drawImage(rect, layer.image, rect)
+            painter.setOpacity(1.0)
+        painter.end()
+        return dirty
+
+    def flatten(self):
+        self.restore()
+        self.compose()
+        return self.pixmap
+
+    def to_image(self):
+        composite = self.flatten()
+        return composite.copy() if self.headless else composite.toImage()
+
+    def is_spilled(self):
+        return self._spilled is not None
+
+    def spill(self, to_disk=True):
+        # every layer is zlib compressed, into a temp file when to_disk, and
+        # the images and the composite are released until restore()
+        if self._spilled is not None:
+            return
+        chunks = [zlib.compress(layer.image.constBits().asstring(layer.image.sizeInBytes()), 1)
+                  if not layer.image.isNull() else b"" for layer in self.layers]
+        sizes = [layer.image.size() for layer in self.layers]
+        if to_disk:
+            handle, path = tempfile.mkstemp(prefix="actionOverlay-canvas-", suffix=".bin")
+            with os.fdopen(handle, "wb") as spill_file:
+                for chunk in chunks:
+                    spill_file.write(chunk)
+            self._spill_cleanup = weakref.finalize(self, remove_spill_file, path)
+            chunks = (path, [len(chunk) for chunk in chunks])
+        self._spilled = (self.size(), sizes, chunks)
+        for layer in self.layers:
+            layer.image = QImage()
+        self.pixmap = QImage() if self.headless else QPixmap()
+        self._dirty = QRegion()
+
+    def _read_spilled(self, sizes, chunks):
+        if isinstance(chunks, tuple):
+            path, lengths = chunks
+            with open(path, "rb") as spill_file:
+                chunks = [spill_file.read(length) for length in lengths]
+            if [len(chunk) for chunk in chunks] != lengths:
+                raise ValueError(f"canvas spill file {path} is truncated")
+        images = []
+        for layer_size, chunk in zip(sizes, chunks):
+            if not chunk:
+                images.append(blank_image(layer_size))
+                continue
+            pixels = zlib.decompress(chunk)
+            if len(pixels) != layer_size.width() * layer_size.height() * 4:
+                raise ValueError("canvas spill data does not match the layer size")
+            images.append(QImage(pixels, layer_size.width(), layer_size.height(), layer_size.width() * 4,
+                                 QImage.Format_ARGB32_Premultiplied).copy())
+        return images
+
+    def restore(self):
+        if self._spilled is None:
+            return
+        size, sizes, chunks = self._spilled
+        try:
+            images = self._read_spilled(sizes, chunks)
+        except (OSError, ValueError, zlib.error) as error:
+            # the drawing is lost, but the canvas stays usable
+            print(f"actionOverlay: could not restore the canvas, starting blank: {error}", file=sys.stderr)
+            images = [blank_image(layer_size) for layer_size in sizes]
+        self._spilled = None
+        if self._spill_cleanup is not None:
+            self._spill_cleanup()
+            self._spill_cleanup = None
+        for layer, image in zip(self.layers, images):
+            layer.image = image
+        self.pixmap = self._new_composite(size)
+        self._dirty = QRegion(self.rect())
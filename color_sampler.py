@@ -0,0 +1,144 @@
+from PyQt5.QtCore import Qt, QPoint, QRect, QTimer
+from PyQt5.QtGui import QPainter, QColor, QPen, QCursor, QImage, QFont
+from PyQt5.QtWidgets import QWidget
+from screen_manager import ScreenManager
+
+
+class ScreenSampler:
+    # every screen is grabbed at most once per picker session, all later
+    # samples and the loupe read from the cached QImage
+    def __init__(self):
+        self._grabs = {}
+
+    def open(self, pos=None):
+        self._grabs = {}
+        self._grab_screen(self._screen_at(pos if pos is not None else QCursor.pos()))
+
+    def release(self):
+        self._grabs = {}
+
+    def is_open(self):
+        return bool(self._grabs)
+
+    def _screen_at(self, pos):
+        info = ScreenManager.instance().info_at(pos)
+        return info.screen if info else None
+
+    def _grab_screen(self, screen):
+        if screen is None:
+            return None
+        grab = self._grabs.get(screen)
+        if grab is None:
+            geometry = ScreenManager.instance().info(screen).geometry
+            image = screen.grabWindow(0, geometry.x(), geometry.y(), geometry.width(), geometry.height()).toImage()
+            image = image.convertToFormat(QImage.Format_RGB32)
+            grab = (geometry, image)
+            self._grabs[screen] = grab
+        return grab
+
+    def _image_point(self, pos):
+        grab = self._grab_screen(self._screen_at(pos))
+        if grab is None:
+            return None, None
+        geometry, image = grab
+        if image.isNull():
+            return None, None
+        scale_x = image.width() / max(geometry.width(), 1)
+        scale_y = image.height() / max(geometry.height(), 1)
+        x = int((pos.x() - geometry.x()) * scale_x)
+        y = int((pos.y() - geometry.y()) * scale_y)
+        x = min(max(x, 0), image.width() - 1)
+        y = min(max(y, 0), image.height() - 1)
+        return image, QPoint(x, y)
+
+    def sample(self, pos, size=1):
+        image, point = self._image_point(pos)
+        if image is None:
+            return None
+        if size <= 1:
+            return QColor(image.pixel(point))
+        half = size // 2
+        area = QRect(point.x() - half, point.y() - half, size, size).intersected(image.rect())
+        red = green = blue = 0
+        for y in range(area.top(), area.bottom() + 1):
+            for x in range(area.left(), area.right() + 1):
+                rgb = image.pixel(x, y)
+                red += (rgb >> 16) & 0xFF
+                green += (rgb >> 8) & 0xFF
+                blue += rgb & 0xFF
+        count = area.width() * area.height()
+        return QColor(red // count, green // count, blue // count)
+
+    def region(self, pos, radius):
+        image, point = self._image_point(pos)
+        if image is None:
+            return None
+        side = radius * 2 + 1
+        # pixels outside the screen stay black instead of shifting the view
+        region = QImage(side, side, QImage.Format_RGB32)
+        region.fill(Qt.black)
+        painter = QPainter(region)
+        painter.drawImage(QPoint(0, 0), image, QRect(point.x() - radius, point.y() - radius, side, side))
+        painter.end()
+        return region
+
+
+class ColorLoupe(QWidget):
+    def __init__(self, sampler, sample_size=1, radius=7, zoom=10):
+        super().__init__()
+        self.setWindowTitle("actionOverlay - Color Loupe")
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool |
+                            Qt.WindowTransparentForInput)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
+        self.setAttribute(Qt.WA_ShowWithoutActivating, True)
+
+        self.sampler = sampler
+        self.sample_size = sample_size
+        self.radius = radius
+        self.zoom = zoom
+        side = (radius * 2 + 1) * zoom
+        self.setFixedSize(side, side + 24)
+
+        self._pos = None
+        self._region = None
+        self._color = None
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.follow_cursor)
+
+    def start(self):
+        self.follow_cursor()
+        self.show()
+        self._timer.start(16)
+
+    def stop(self):
+        self._timer.stop()
+        self.close()
+
+    def follow_cursor(self):
+        pos = QCursor.pos()
+        if pos == self._pos:
+            return
+        self._pos = pos
+        self._region = self.sampler.region(pos, self.radius)
+        self._color = self.sampler.sample(pos, self.sample_size)
+        self.move(pos + QPoint(24, 24))
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        side = self.width()
+        if self._region is not None:
+            painter.drawImage(QRect(0, 0, side, side), self._region)
+        painter.setPen(QPen(QColor("#fff"), 1))
+        box = self.sample_size * self.zoom
+        painter.drawRect((side - box) // 2, (side - box) // 2, box, box)
+        painter.setPen(QPen(QColor("#222"), 2))
+        painter.drawRect(self.rect().adjusted(1, 1, -1, -1))
+        if self._color is not None:
+            info = QRect(0, side, side, self.height() - side)
+            painter.fillRect(info, self._color)
+            painter.setPen(QColor("#000") if self._color.lightness() > 128 else QColor("#fff"))
+            painter.setFont(QFont("Arial", 9))
+            painter.drawText(info, Qt.AlignCenter, self._color.name())
+        painter.end()
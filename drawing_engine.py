@@ -0,0 +1,307 @@
+import os
+import sys
+from array import array
+from PyQt5.QtCore import Qt, QPoint, QPointF, QRect, QSize
+from PyQt5.QtGui import QGuiApplication, QPainter, QPen, QColor, QImage
+from PyQt5 import sip
+from brush_stamps import BrushStampCache, stamp_segment
+from canvas_layers import LayeredCanvas, Layer
+from shapes import draw_shape, shape_bounds
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+ERASER_INK = QColor(0, 0, 0)
+
+
+def ensure_app():
+    # engines are headless (QImage only) and need no application; this is
+    # for scripts that also use a window canvas, a QPixmap or fonts, and
+    # picks the offscreen platform when there is no display
+    app = QGuiApplication.instance()
+    if app is None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        app = QGuiApplication(sys.argv[:1])
+    return app
+
+
+def to_point(value):
+    if isinstance(value, QPointF):
+        return value
+    if isinstance(value, QPoint):
+        return QPointF(value)
+    return QPointF(*value)
+
+
+def to_point_pair(a, b):
+    return to_point(a), to_point(b)
+
+
+def flood_fill(image, x, y, fill_color):
+    # 4-connected scanline fill straight on the 32 bit pixels; returns False
+    # when the pixel already has the fill color
+    width, height = image.width(), image.height()
+    stride = image.bytesPerLine() // 4
+    bits = image.bits()
+    bits.setsize(image.sizeInBytes())
+    pixels = memoryview(bits).cast("I")
+    target = pixels[y * stride + x]
+
+    probe = QImage(1, 1, image.format())
+    probe.setPixelColor(0, 0, fill_color)
+    replacement = memoryview(probe.constBits().asstring(4)).cast("I")[0]
+    if target == replacement:
+        return False
+
+    row_fill = array("I", [replacement]) * width
+    stack = [(x, y)]
+    while stack:
+        x, y = stack.pop()
+        row = y * stride
+        if pixels[row + x] != target:
+            continue
+        left = x
+        while left > 0 and pixels[row + left - 1] == target:
+            left -= 1
+        right = x
+        while right < width - 1 and pixels[row + right + 1] == target:
+            right += 1
+        pixels[row + left:row + right + 1] = row_fill[:right - left + 1]
+        for next_y in (y - 1, y + 1):
+            if next_y < 0 or next_y >= height:
+                continue
+            next_row = next_y * stride
+            in_run = False
+            for next_x in range(left, right + 1):
+                if pixels[next_row + next_x] == target:
+                    if not in_run:
+                        stack.append((next_x, next_y))
+                        in_run = True
+                else:
+                    in_run = False
+    return True
+
+
+class DrawingEngine:
+    def __init__(self, canvas=None, size=QSize(800, 600)):
+        self.canvas = canvas if canvas is not None else LayeredCanvas(size, headless=True)
+        self.color = QColor(255, 255, 255)
+        self.width = 3
+        self.eraser = False
+        self.pen = QPen(self.color, self.width, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+        # cached brush stamps taper smoothly inside a segment but benchmark
+        # slower than changing the width of one pen per segment, so strokes
+        # use the pen unless this is switched on
+        self.use_stamps = False
+        self.brush_stamps = BrushStampCache()
+        self.buffer = None
+        self._painter = None
+        self._painter_key = None
+        self._batching = False
+        self._last_point = None
+        self._last_width = None
+        self._stroke_started = False
+
+    @classmethod
+    def from_image(cls, image):
+        # ARGB32_Premultiplied images are drawn on in place, anything else is
+        # converted once and the copy is available as engine.image
+        if image.format() != QImage.Format_ARGB32_Premultiplied:
+            image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        canvas = LayeredCanvas(image.size(), layers=(("image", 1.0),), headless=True)
+        canvas.layers[0].image = image
+        canvas.mark_dirty()
+        return cls(canvas)
+
+    @classmethod
+    def from_array(cls, pixels):
+        # height x width x 4 uint8 array in premultiplied BGRA byte order
+        # (QImage's ARGB32 on little endian machines), drawn on in place
+        if numpy is None:
+            raise RuntimeError("numpy is not installed")
+        if pixels.dtype != numpy.uint8 or pixels.ndim != 3 or pixels.shape[2] != 4:
+            raise ValueError("expected a height x width x 4 uint8 array")
+        if not pixels.flags["C_CONTIGUOUS"]:
+            raise ValueError("expected a C contiguous array")
+        height, width = pixels.shape[:2]
+        image = QImage(sip.voidptr(pixels.ctypes.data), width, height, pixels.strides[0],
+                       QImage.Format_ARGB32_Premultiplied)
+        engine = cls.from_image(image)
+        # the QImage does not own the memory, keep the array alive with it
+        engine.buffer = pixels
+        return engine
+
+    @property
+    def image(self):
+        return self.canvas.layers[0].image
+
+    def set_tool(self, color=None, eraser=None, width=None):
+        if color is not None:
+            self.color = QColor(color)
+        if eraser is not None:
+            self.eraser = eraser
+        if width is not None:
+            self.width = width
+
+    def layer(self, layer=None):
+        if layer is None:
+            return self.canvas.active_layer()
+        if isinstance(layer, Layer):
+            return layer
+        return self.canvas.layer(layer)
+
+    def _begin_paint(self, layer):
+        # inside apply() one painter is kept open while consecutive
+        # operations target the same layer with the same mode
+        key = (id(layer.image), self.eraser)
+        if self._painter is not None and self._painter_key == key:
+            return self._painter
+        self._end_paint()
+        painter = QPainter(layer.image)
+        if not painter.isActive():
+            return None
+        if self.eraser:
+            painter.setCompositionMode(QPainter.CompositionMode_DestinationOut)
+        if self._batching:
+            self._painter = painter
+            self._painter_key = key
+        return painter
+
+    def _done_paint(self, painter):
+        if painter is not self._painter:
+            painter.end()
+
+    def _end_paint(self):
+        if self._painter is not None:
+            self._painter.end()
+            self._painter = None
+            self._painter_key = None
+
+    def _ink(self):
+        # strokes are opaque, so destination-out clears exactly their coverage
+        return ERASER_INK if self.eraser else self.color
+
+    def draw_line(self, from_point, to_point, from_width=None, to_width=None, layer=None, first=True):
+        layer = self.layer(layer)
+        if layer is None or layer.image.isNull():
+            return None
+        from_point, to_point = to_point_pair(from_point, to_point)
+        if from_width is None:
+            from_width = self.width
+        if to_width is None:
+            to_width = from_width
+        painter = self._begin_paint(layer)
+        if painter is None:
+            return None
+        if self.use_stamps:
+            stamp_segment(painter, self.brush_stamps, from_point, to_point, from_width, to_width, self._ink(), first)
+        else:
+            pen = self.pen
+            pen.setColor(self._ink())
+            pen.setWidthF((from_width + to_width) / 2)
+            painter.setPen(pen)
+            painter.drawLine(from_point, to_point)
+        self._done_paint(painter)
+        margin = int(max(from_width, to_width) / 2) + 2
+        bounds = QRect(from_point.toPoint(), to_point.toPoint()).normalized()
+        bounds = bounds.adjusted(-margin, -margin, margin, margin)
+        self.canvas.mark_dirty(bounds)
+        return bounds
+
+    def begin_stroke(self, point, width=None):
+        self._last_point = to_point(point)
+        self._last_width = self.width if width is None else width
+        self._stroke_started = False
+
+    def stroke_to(self, point, width=None, layer=None):
+        if self._last_point is None:
+            self.begin_stroke(point, width)
+            return None
+        point = to_point(point)
+        width = self._last_width if width is None else width
+        bounds = self.draw_line(self._last_point, point, self._last_width, width, layer, not self._stroke_started)
+        self._stroke_started = True
+        self._last_point = point
+        self._last_width = width
+        return bounds
+
+    def end_stroke(self):
+        self._last_point = None
+
+    def stroke(self, points, width=None, widths=None, layer=None):
+        if not points:
+            return
+        widths = widths or [self.width if width is None else width] * len(points)
+        self.begin_stroke(points[0], widths[0])
+        for point, point_width in zip(points[1:], widths[1:]):
+            self.stroke_to(point, point_width, layer)
+        self.end_stroke()
+
+    def shape(self, kind, start, end, width=None, layer=None):
+        layer = self.layer(layer)
+        if layer is None or layer.image.isNull():
+            return None
+        start, end = to_point_pair(start, end)
+        width = self.width if width is None else width
+        painter = self._begin_paint(layer)
+        if painter is None:
+            return None
+        draw_shape(painter, kind, start, end, QPen(self._ink(), width, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+        self._done_paint(painter)
+        bounds = shape_bounds(kind, start, end, width)
+        self.canvas.mark_dirty(bounds)
+        return bounds
+
+    def fill(self, x, y, layer=None):
+        layer = self.layer(layer)
+        if layer is None:
+            return False
+        x, y = int(x), int(y)
+        image = layer.image
+        if x < 0 or y < 0 or x >= image.width() or y >= image.height():
+            return False
+        # the fill writes the pixels directly, an open painter must not
+        # flush over them afterwards
+        self._end_paint()
+        fill_color = QColor(0, 0, 0, 0) if self.eraser else self.color
+        if not flood_fill(image, x, y, fill_color):
+            return False
+        self.canvas.mark_dirty()
+        return True
+
+    def clear(self, layer=None):
+        self._end_paint()
+        self.canvas.clear(layer.name if isinstance(layer, Layer) else layer)
+
+    def apply(self, operations):
+        # operations are dicts like {"op": "stroke", "points": [[x, y], ...],
+        # "width": 4} naming a method and its keyword arguments, so a whole
+        # template can be rendered from json in one call
+        self._batching = True
+        try:
+            for operation in operations:
+                operation = dict(operation)
+                getattr(self, OPERATIONS[operation.pop("op")])(**operation)
+        finally:
+            self._batching = False
+            self._end_paint()
+        return len(operations)
+
+    def render(self):
+        return self.canvas.to_image()
+
+
+# names accepted by DrawingEngine.apply
+OPERATIONS = {
+    "tool": "set_tool",
+    "line": "draw_line",
+    "stroke": "stroke",
+    "begin_stroke": "begin_stroke",
+    "stroke_to": "stroke_to",
+    "end_stroke": "end_stroke",
+    "shape": "shape",
+    "fill": "fill",
+    "clear": "clear",
+}
@@ -0,0 +1,911 @@
+from PyQt5.QtCore import Qt, QPoint, QPointF, QRect, QEvent
+from PyQt5.QtWidgets import (QApplication, QWidget, QPushButton, QVBoxLayout, QHBoxLayout, QLabel,
+                             QSizePolicy, QSlider, QFileDialog, QMenu, QMessageBox)
+from PyQt5.QtGui import QCursor, QPainter, QPen, QColor
+from brush_stamps import PenDynamics
+from drawing_engine import DrawingEngine
+from region_capture import RegionCapture
+from color_sampler import ScreenSampler, ColorLoupe
+from event_dispatch import EventDispatcher
+from canvas_layers import LayeredCanvas
+from shapes import ShapePreview, recognize_shape
+from screen_manager import ScreenManager
+from session_recorder import SessionRecorder, SessionPlayer, SESSION_FILTER
+
+# N x N areas the color picker can average, chosen with a right click on 🎨
+COLOR_SAMPLE_SIZES = (1, 3, 5, 9)
+
+
+class DrawingWindow(QWidget):
+    def __init__(self, parent=None, color_sample_size=1):
+        super().__init__(parent)
+        self.setWindowTitle("actionOverlay - Drawing Window")
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Window)
+        self.setAttribute(Qt.WA_TranslucentBackground, True)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.title_bar = QWidget(self)
+        self.title_bar.setFixedHeight(32)
+        self.title_bar.setStyleSheet("background-color: #333;")
+
+        title_layout = QHBoxLayout(self.title_bar)
+        title_layout.setContentsMargins(5, 0, 5, 0)
+
+        title_layout.addStretch()
+
+        self.bucket_button = QPushButton("🪣")
+        self.bucket_button.setFixedSize(32, 32)
+        self.bucket_button.setCheckable(True)
+        self.bucket_button.setToolTip("Fill Bucket")
+        self.bucket_button.setStyleSheet("""
+            QPushButton {
+                background-color: #eee;
+                color: #222;
+                border: 2px solid #222;
+                border-radius: 4px;
+                font-size: 16px;
+            }
+            QPushButton:checked {
+                background-color: #fff;
+                border: 2px solid #FFD600;
+                color: #FFD600;
+            }
+        """)
+        self.bucket_button.clicked.connect(self.set_bucket_mode)
+        title_layout.addWidget(self.bucket_button)
+
+        self.color_picker_button = QPushButton("🎨")
+        self.color_picker_button.setFixedSize(32, 32)
+        self.color_picker_button.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.color_picker_button.customContextMenuRequested.connect(self.show_color_sample_menu)
+        self.color_picker_button.setStyleSheet("""
+            QPushButton {
+                background-color: #eee;
+                color: #222;
+                border: 2px solid #222;
+                border-radius: 4px;
+                font-size: 16px;
+            }
+            QPushButton:pressed {
+                background-color: #fff;
+                border: 2px solid #2196F3;
+                color: #2196F3;
+            }
+        """)
+        self.color_picker_button.clicked.connect(self.pick_color_from_screen)
+        title_layout.addWidget(self.color_picker_button)
+
+        # sepparator
+        sep = QWidget()
+        sep.setFixedWidth(2)
+        sep.setFixedHeight(24)
+        sep.setStyleSheet("background-color: #fff; margin-left: 6px; margin-right: 6px; border-radius: 1px;")
+        title_layout.addWidget(sep)
+
+        self.eraser_button = QPushButton("⎚")
+        self.eraser_button.setFixedSize(32, 32)
+        self.eraser_button.setCheckable(True)
+        self.eraser_button.setToolTip("Eraser")
+        self.eraser_button.setStyleSheet("""
+            QPushButton {
+                background-color: #eee;
+                color: #222;
+                border: 2px solid #222;
+                border-radius: 4px;
+                font-size: 16px;
+            }
+            QPushButton:checked {
+                background-color: #fff;
+                border: 2px solid #2196F3;
+                color: #2196F3;
+            }
+        """)
+        self.eraser_button.clicked.connect(self.set_eraser_mode)
+        title_layout.addWidget(self.eraser_button)
+
+        shape_button_style = """
+            QPushButton {
+                background-color: #eee;
+                color: #222;
+                border: 2px solid #222;
+                border-radius: 4px;
+                font-size: 16px;
+            }
+            QPushButton:checked {
+                background-color: #fff;
+                border: 2px solid #9C27B0;
+                color: #9C27B0;
+            }
+        """
+        self.shape_buttons = {}
+        for kind, icon in (("line", "╱"), ("rectangle", "▭"), ("ellipse", "◯"), ("arrow", "➚")):
+            btn = QPushButton(icon)
+            btn.setFixedSize(32, 32)
+            btn.setCheckable(True)
+            btn.setToolTip(f"Draw a {kind}")
+            btn.setStyleSheet(shape_button_style)
+            btn.clicked.connect(lambda _, k=kind: self.set_shape_mode(k))
+            self.shape_buttons[kind] = btn
+            title_layout.addWidget(btn)
+
+        self.snap_button = QPushButton("≈")
+        self.snap_button.setFixedSize(32, 32)
+        self.snap_button.setCheckable(True)
+        self.snap_button.setToolTip("Snap freehand strokes to lines, rectangles and ellipses")
+        self.snap_button.setStyleSheet(shape_button_style)
+        title_layout.addWidget(self.snap_button)
+
+        self.color_buttons = []
+        color_defs = [
+            ("#FFD600", "yellow"),
+            ("#FF9800", "orange"),
+            ("#F44336", "red"),
+            ("#B71C1C", "dark red"),
+            ("#E91E63", "pink"),
+            ("#880E4F", "dark pink"),
+            ("#9C27B0", "purple"),
+            ("#4A148C", "dark purple"),
+            ("#0D47A1", "dark blue"),
+            ("#00BCD4", "cyan"),
+            ("#006064", "dark cyan"),
+            ("#4CAF50", "green"),
+            ("#1B5E20", "dark green"),
+            ("#8D5524", "brown"),
+            ("#212121", "dark gray"),
+            ("#FFFFFF", "white"),
+            ("#000000", "black"),
+        ]
+        self.pen = QPen(QColor(255, 255, 255), 3, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+
+        def make_color_btn(color, tooltip):
+            btn = QPushButton()
+            btn.setFixedSize(30, 30)
+            btn.setStyleSheet(f"""
+                QPushButton {{
+                    background-color: {color};
+                    border: 2px solid #222;
+                    border-radius: 4px;
+                }}
+                QPushButton:checked {{
+                    border: 2px solid #fff;
+                }}
+            """)
+            btn.setToolTip(tooltip)
+            btn.setCheckable(True)
+            btn.clicked.connect(lambda _, c=color: self.set_pen_color(c))
+            return btn
+
+        self.color_btn_group = []
+        for color, name in color_defs:
+            btn = make_color_btn(color, name)
+            self.color_buttons.append(btn)
+            title_layout.addWidget(btn)
+            self.color_btn_group.append(btn)
+        self.color_btn_group[2].setChecked(True)
+
+        # sepparator
+        sep = QWidget()
+        sep.setFixedWidth(2)
+        sep.setFixedHeight(24)
+        sep.setStyleSheet("background-color: #fff; margin-left: 6px; margin-right: 6px; border-radius: 1px;")
+        title_layout.addWidget(sep)
+
+        self.thickness_slider = QSlider(Qt.Horizontal)
+        self.thickness_slider.setMinimum(1)
+        self.thickness_slider.setMaximum(100)
+        self.thickness_slider.setValue(3)
+        self.thickness_slider.setFixedWidth(100)
+        self.thickness_slider.setToolTip("Pen thickness")
+        self.thickness_slider.setStyleSheet("""
+            QSlider::groove:horizontal {
+                border: 1px solid #444;
+                height: 22px;
+                background: transparent;
+                margin: 0px;
+                border-radius: 4px;
+            }
+            QSlider::sub-page:horizontal {
+                background: #2196F3;
+                border-radius: 4px;
+            }
+            QSlider::add-page:horizontal {
+                background: #222;
+                border-radius: 4px;
+            }
+            QSlider::handle:horizontal {
+                background: #fff;
+                border: 2px solid #2196F3;
+                width: 22px;
+                margin: -7px 0;
+                border-radius: 4px;
+            }
+        """)
+        self.thickness_slider.valueChanged.connect(self.set_pen_thickness)
+        title_layout.addWidget(self.thickness_slider)
+
+        # sepparator
+        sep = QWidget()
+        sep.setFixedWidth(2)
+        sep.setFixedHeight(24)
+        sep.setStyleSheet("background-color: #fff; margin-left: 6px; margin-right: 6px; border-radius: 1px;")
+        title_layout.addWidget(sep)
+
+        layer_button_style = """
+            QPushButton {
+                background-color: #eee;
+                color: #222;
+                border: 2px solid #222;
+                border-radius: 4px;
+                font-size: 16px;
+            }
+            QPushButton:checked {
+                background-color: #fff;
+                border: 2px solid #4CAF50;
+                color: #4CAF50;
+            }
+        """
+        self.layer_buttons = {}
+        for name, icon in (("ink", "✎"), ("highlighter", "▌"), ("background", "▦")):
+            btn = QPushButton(icon)
+            btn.setFixedSize(32, 32)
+            btn.setCheckable(True)
+            btn.setToolTip(f"Draw on the {name} layer")
+            btn.setStyleSheet(layer_button_style)
+            btn.clicked.connect(lambda _, n=name: self.set_active_layer(n))
+            self.layer_buttons[name] = btn
+            title_layout.addWidget(btn)
+        self.layer_buttons["ink"].setChecked(True)
+
+        self.layer_visibility_button = QPushButton("👁")
+        self.layer_visibility_button.setFixedSize(32, 32)
+        self.layer_visibility_button.setCheckable(True)
+        self.layer_visibility_button.setChecked(True)
+        self.layer_visibility_button.setToolTip("Show/hide the active layer")
+        self.layer_visibility_button.setStyleSheet(layer_button_style)
+        self.layer_visibility_button.clicked.connect(self.toggle_layer_visibility)
+        title_layout.addWidget(self.layer_visibility_button)
+
+        self.layer_opacity_slider = QSlider(Qt.Horizontal)
+        self.layer_opacity_slider.setMinimum(5)
+        self.layer_opacity_slider.setMaximum(100)
+        self.layer_opacity_slider.setValue(100)
+        self.layer_opacity_slider.setFixedWidth(60)
+        self.layer_opacity_slider.setToolTip("Active layer opacity")
+        self.layer_opacity_slider.setStyleSheet(self.thickness_slider.styleSheet())
+        self.layer_opacity_slider.valueChanged.connect(self.set_layer_opacity)
+        title_layout.addWidget(self.layer_opacity_slider)
+
+        title_layout.addStretch()
+
+        self.close_button = QPushButton("✕")
+        self.close_button.setFixedSize(30, 30)
+        self.close_button.setStyleSheet("""
+            QPushButton {
+                color: white;
+                border: 1px solid #000;
+                background-color: #ff0000;
+                border-radius: 2px;
+            }
+            QPushButton:hover {
+                background-color: #555;
+                border-radius: 2px;
+            }
+        """)
+        self.close_button.clicked.connect(self.close)
+
+        self.clear_button = QPushButton("CLR")
+        self.clear_button.setFixedSize(40, 30)
+        self.clear_button.setStyleSheet("""
+            QPushButton {
+                color: white;
+                border: 1px solid #000;
+                background-color: #f47c36;
+                border-radius: 2px;
+            }
+            QPushButton:hover {
+                background-color: #555;
+                border-radius: 2px;
+            }
+        """)
+        self.clear_button.setToolTip("Clear the drawing")
+        self.clear_button.clicked.connect(self.clear_drawing)
+
+        self.print_screen_button = QPushButton("⌜⌟", self)
+        self.print_screen_button.setFixedSize(30, 30)
+        self.print_screen_button.setStyleSheet("""
+            QPushButton {
+                color: white;
+                border: 1px solid #000;
+                background-color: #2196F3;
+                border-radius: 2px;
+            }
+            QPushButton:hover {
+                background-color: #555;
+                border-radius: 2px;
+            }
+        """)
+        self.print_screen_button.setToolTip("Capture a region with the drawing on top")
+        self.print_screen_button.clicked.connect(self.take_screenshot)
+
+        self.download_button = QPushButton("↓", self)
+        self.download_button.setFixedSize(30, 30)
+        self.download_button.setStyleSheet("""
+            QPushButton {
+                color: white;
+                border: 1px solid #000;
+                background-color: #4CAF50;
+                border-radius: 2px;
+            }
+            QPushButton:hover {
+                background-color: #555;
+                border-radius: 2px;
+            }
+        """)
+        self.download_button.setToolTip("Download the drawing as PNG")
+        self.download_button.clicked.connect(self.save_as_png)
+
+        self.record_button = QPushButton("⏺", self)
+        self.record_button.setFixedSize(30, 30)
+        self.record_button.setCheckable(True)
+        self.record_button.setStyleSheet("""
+            QPushButton {
+                color: white;
+                border: 1px solid #000;
+                background-color: #795548;
+                border-radius: 2px;
+            }
+            QPushButton:hover {
+                background-color: #555;
+                border-radius: 2px;
+            }
+            QPushButton:checked {
+                background-color: #F44336;
+            }
+        """)
+        self.record_button.setToolTip("Record the drawing session")
+        self.record_button.clicked.connect(self.toggle_recording)
+
+        self.replay_button = QPushButton("▶", self)
+        self.replay_button.setFixedSize(30, 30)
+        self.replay_button.setStyleSheet("""
+            QPushButton {
+                color: white;
+                border: 1px solid #000;
+                background-color: #795548;
+                border-radius: 2px;
+            }
+            QPushButton:hover {
+                background-color: #555;
+                border-radius: 2px;
+            }
+        """)
+        self.replay_button.setToolTip("Replay a recorded drawing session at 4x speed")
+        self.replay_button.clicked.connect(self.replay_session)
+
+        title_layout.addWidget(self.record_button)
+        title_layout.addWidget(self.replay_button)
+        title_layout.addWidget(self.print_screen_button)
+        title_layout.addWidget(self.download_button)
+        title_layout.addWidget(self.clear_button)
+        title_layout.addWidget(self.close_button)
+        layout.addWidget(self.title_bar)
+
+        self.drawing_label = QLabel(self)
+        self.drawing_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.drawing_label.setStyleSheet("background-color: rgba(30, 30, 30, 20);")
+        layout.addWidget(self.drawing_label)
+
+        self.canvas = LayeredCanvas()
+        self.last_point = None
+        self.last_width = None
+        self._stroke_started = False
+        self.engine = DrawingEngine(self.canvas)
+        self.pen_dynamics = PenDynamics()
+
+        self.dragging = False
+        self.offset = QPoint()
+
+        self.drawing_label.showEvent = self.update_drawing_surface
+        self.drawing_label.paintEvent = self.paint_drawing_surface
+
+        self.shape_preview = ShapePreview(self.drawing_label)
+        self.shape_mode = None
+        self.shape_start = None
+        self.stroke_points = []
+        self._stroke_snapshot = None
+
+        self.showEvent = self.set_available_geometry_on_show
+
+        self.eraser_mode = False
+        self.bucket_mode = False
+        self._color_picker_active = False
+        self.region_capture = None
+        self.recorder = None
+        self.player = None
+        self.screen_sampler = ScreenSampler()
+        self.color_loupe = None
+        self.set_color_sample_size(color_sample_size)
+
+    def set_color_sample_size(self, size):
+        self.color_sample_size = size
+        self.color_picker_button.setToolTip(
+            f"Pick color from anywhere, averaging {size}x{size} pixels (right-click to change)")
+        if self.color_loupe is not None:
+            self.color_loupe.sample_size = size
+            self.color_loupe.update()
+
+    def show_color_sample_menu(self, pos):
+        menu = QMenu(self)
+        menu.setStyleSheet("""
+            QMenu {
+                background-color: #222;
+                color: white;
+                border: 1px solid #444;
+            }
+            QMenu::item:selected {
+                background-color: #2196F3;
+            }
+        """)
+        for size in COLOR_SAMPLE_SIZES:
+            action = menu.addAction(f"average {size}x{size} pixels")
+            action.setCheckable(True)
+            action.setChecked(size == self.color_sample_size)
+            action.triggered.connect(lambda _, size=size: self.set_color_sample_size(size))
+        menu.exec_(self.color_picker_button.mapToGlobal(pos))
+
+    def pick_color_from_screen(self):
+        # If bucket mode is active, deactivate it
+        if self.bucket_button.isChecked():
+            self.bucket_button.setChecked(False)
+            self.set_bucket_mode()
+        if self._color_picker_active:
+            return
+        QApplication.processEvents()
+        self._color_picker_active = True
+        self.screen_sampler.open()
+        self.color_loupe = ColorLoupe(self.screen_sampler, self.color_sample_size)
+        self.color_loupe.start()
+
+        self.color_picker_button.setStyleSheet("""
+            QPushButton {
+                background-color: #eee;
+                color: #222;
+                border: 2px solid #FFA500;
+                border-radius: 4px;
+                font-size: 16px;
+            }
+            QPushButton:pressed {
+                background-color: #fff;
+                border: 2px solid #2196F3;
+                color: #2196F3;
+            }
+        """)
+
+        def on_click(event):
+            if self._color_picker_active and event.button() == Qt.LeftButton:
+                pos = QCursor.pos()
+                color = self.get_pixel_color(pos)
+                if color:
+                    self.set_pen_color(color.name())
+                    for btn in self.color_btn_group:
+                        btn.setChecked(False)
+                    self.eraser_button.setChecked(False)
+                    self.color_picker_button.setStyleSheet(f"""
+                        QPushButton {{
+                            background-color: {color.name()};
+                            color: #222;
+                            border: 2px solid #222;
+                            border-radius: 4px;
+                            font-size: 16px;
+                        }}
+                        QPushButton:pressed {{
+                            background-color: #fff;
+                            border: 2px solid #2196F3;
+                            color: #2196F3;
+                        }}
+                    """)
+                self._color_picker_active = False
+                self.close_color_picker_preview()
+                self.activateWindow()
+            return False
+
+        def on_key(event):
+            if event.key() == Qt.Key_Escape:
+                self.stop_color_picker()
+                return True
+            return False
+
+        dispatcher = EventDispatcher.instance()
+        dispatcher.register(self.color_picker_button, QEvent.MouseButtonPress, on_click)
+        dispatcher.register(self.color_picker_button, QEvent.KeyPress, on_key)
+
+    def stop_color_picker(self):
+        if not self._color_picker_active:
+            return
+        self._color_picker_active = False
+        self.close_color_picker_preview()
+        self.color_picker_button.setStyleSheet("""
+            QPushButton {
+                background-color: #eee;
+                color: #222;
+                border: 2px solid #222;
+                border-radius: 4px;
+                font-size: 16px;
+            }
+            QPushButton:pressed {
+                background-color: #fff;
+                border: 2px solid #2196F3;
+                color: #2196F3;
+            }
+        """)
+
+    def close_color_picker_preview(self):
+        EventDispatcher.instance().unregister(self.color_picker_button)
+        if self.color_loupe is not None:
+            self.color_loupe.stop()
+            self.color_loupe = None
+        self.screen_sampler.release()
+
+    def get_pixel_color(self, pos):
+        if self.screen_sampler.is_open():
+            return self.screen_sampler.sample(pos, self.color_sample_size)
+        info = ScreenManager.instance().info_at(pos)
+        if not info:
+            return None
+        screen = info.screen
+        pixmap = screen.grabWindow(0, pos.x(), pos.y(), 1, 1)
+        if pixmap.isNull():
+            return None
+        image = pixmap.toImage()
+        if image.isNull():
+            return None
+        color = QColor(image.pixel(0, 0))
+        return color
+
+    def save_as_png(self):
+        pixmap = self.canvas.flatten()
+        if pixmap.isNull():
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Drawing as PNG", "drawing.png", "PNG Files (*.png)")
+        if file_path:
+            from PyQt5.QtGui import QImage
+            image = pixmap.toImage().convertToFormat(QImage.Format_ARGB32)
+            image.save(file_path, "PNG")
+
+    def toggle_recording(self):
+        # a replay would clear and redraw the canvas without being recorded,
+        # so the two never run at the same time
+        self.replay_button.setEnabled(not self.record_button.isChecked())
+        if self.record_button.isChecked():
+            self.recorder = SessionRecorder(self.canvas)
+            return
+        recorder = self.recorder
+        self.recorder = None
+        if recorder is None:
+            return
+        # ask again after a failed write so the recording is not lost
+        while True:
+            file_path, _ = QFileDialog.getSaveFileName(self, "Save Drawing Session", "session.aosr", SESSION_FILTER)
+            if not file_path:
+                return
+            try:
+                with open(file_path, "wb") as session:
+                    session.write(recorder.data())
+                return
+            except OSError as error:
+                self.show_error("Save Drawing Session", f"Could not save the session:\n{error}")
+
+    def replay_session(self, file_path=None, speed=4.0):
+        if self.recorder is not None:
+            return
+        if not file_path:
+            file_path, _ = QFileDialog.getOpenFileName(self, "Replay Drawing Session", "", SESSION_FILTER)
+        if not file_path:
+            return
+        try:
+            with open(file_path, "rb") as session:
+                player = SessionPlayer(session.read(), canvas=self.canvas, parent=self)
+        except (OSError, ValueError) as error:
+            self.show_error("Replay Drawing Session", f"Could not replay {file_path}:\n{error}")
+            return
+        self.stop_replay()
+        self.clear_drawing()
+        self.record_button.setEnabled(False)
+        self.player = player
+        self.player.updated.connect(self.drawing_label.update)
+        self.player.finished.connect(lambda: self.record_button.setEnabled(True))
+        self.player.play(speed)
+
+    def show_error(self, title, message):
+        QMessageBox.warning(self, title, message)
+
+    def stop_replay(self):
+        if self.player is not None:
+            self.player.stop()
+        self.record_button.setEnabled(True)
+
+    def take_screenshot(self):
+        self.region_capture = RegionCapture(
+            layer=self.canvas.flatten(),
+            layer_origin=self.drawing_label.mapToGlobal(QPoint(0, 0)),
+            hide_windows=[self],
+        )
+        self.region_capture.start()
+
+    def set_eraser_mode(self):
+        if self.eraser_button.isChecked():
+            self.eraser_mode = True
+            for btn in self.color_btn_group:
+                btn.setChecked(False)
+            self.pen.setColor(Qt.transparent)
+            self.pen.setWidth(self.thickness_slider.value())
+        else:
+            self.eraser_mode = False
+            checked = [btn for btn in self.color_btn_group if btn.isChecked()]
+            if checked:
+                idx = self.color_btn_group.index(checked[0])
+                color = self.color_buttons[idx].palette().button().color()
+                self.pen.setColor(color)
+            else:
+                self.pen.setColor(QColor("#FFFFFF"))
+            self.pen.setWidth(self.thickness_slider.value())
+
+    def set_bucket_mode(self):
+        if self.bucket_button.isChecked():
+            # If color picker is active, deactivate it
+            self.stop_color_picker()
+            self.set_shape_mode(None)
+            self.bucket_mode = True
+        else:
+            self.bucket_mode = False
+
+    def set_pen_color(self, color):
+        self.eraser_button.setChecked(False)
+        self.eraser_mode = False
+        for btn in self.color_btn_group:
+            btn.setChecked(False)
+        sender = self.sender()
+        if sender:
+            sender.setChecked(True)
+        self.pen.setColor(QColor(color))
+        self.pen.setWidth(self.thickness_slider.value())
+
+    def set_pen_thickness(self, value):
+        self.pen.setWidth(value)
+
+    def set_shape_mode(self, kind):
+        if kind is not None and self.shape_mode == kind:
+            kind = None
+        self.shape_mode = kind
+        for shape_kind, btn in self.shape_buttons.items():
+            btn.setChecked(shape_kind == kind)
+        if kind is not None and self.bucket_button.isChecked():
+            self.bucket_button.setChecked(False)
+            self.set_bucket_mode()
+
+    def shape_pen(self):
+        color = QColor(0, 0, 0) if self.eraser_mode else self.pen.color()
+        return QPen(color, self.thickness_slider.value(), Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin)
+
+    def commit_shape(self, kind, start, end):
+        width = self.thickness_slider.value()
+        if self.recorder is not None:
+            start, end = self.recorder.shape(kind, start, end, width, self.pen.color(), self.eraser_mode,
+                                             self.canvas.active_index)
+        self.engine.set_tool(self.pen.color(), self.eraser_mode)
+        self.engine.shape(kind, start, end, width)
+        self.refresh_canvas()
+
+    def snap_stroke(self):
+        shape = recognize_shape(self.stroke_points)
+        if shape is None or self._stroke_snapshot is None:
+            return
+        layer = self.canvas.active_layer()
+        layer.image = self._stroke_snapshot
+        if self.recorder is not None:
+            self.recorder.restore()
+        self.canvas.mark_dirty()
+        self.commit_shape(*shape)
+
+    def set_active_layer(self, name):
+        layer = self.canvas.set_active(name)
+        for layer_name, btn in self.layer_buttons.items():
+            btn.setChecked(layer_name == name)
+        if layer is None:
+            return
+        self.layer_visibility_button.setChecked(layer.visible)
+        self.layer_opacity_slider.blockSignals(True)
+        self.layer_opacity_slider.setValue(int(round(layer.opacity * 100)))
+        self.layer_opacity_slider.blockSignals(False)
+
+    def toggle_layer_visibility(self):
+        self.canvas.set_visible(self.canvas.active_layer().name, self.layer_visibility_button.isChecked())
+        self.record_layer_state()
+        self.refresh_canvas()
+
+    def set_layer_opacity(self, value):
+        self.canvas.set_opacity(self.canvas.active_layer().name, value / 100)
+        self.record_layer_state()
+        self.refresh_canvas()
+
+    def record_layer_state(self):
+        if self.recorder is not None:
+            layer = self.canvas.active_layer()
+            self.recorder.layer_state(self.canvas.active_index, layer.visible, layer.opacity)
+
+    def set_available_geometry_on_show(self, event):
+        self.canvas.restore()
+        ScreenManager.instance().move_widget_to_screen(self, available=True)
+        event.accept()
+
+    def set_fullscreen_on_show(self, event):
+        self.canvas.restore()
+        ScreenManager.instance().move_widget_to_screen(self, available=False)
+        event.accept()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            if self.title_bar.underMouse():
+                on_slider = False
+                for slider in (self.thickness_slider, self.layer_opacity_slider):
+                    slider_rect = slider.geometry()
+                    slider_pos = slider.mapToGlobal(slider_rect.topLeft())
+                    slider_rect_global = QRect(slider_pos, slider.size())
+                    on_slider = on_slider or slider_rect_global.contains(event.globalPos())
+                if not on_slider:
+                    self.dragging = True
+                    self.offset = event.pos()
+            elif self.drawing_label.underMouse():
+                if self.bucket_mode:
+                    self.bucket_fill(event.pos() - self.drawing_label.pos())
+                elif self.shape_mode is not None:
+                    self.shape_start = QPointF(event.pos() - self.drawing_label.pos())
+                else:
+                    self.begin_stroke(event.pos() - self.drawing_label.pos(), event.timestamp())
+
+    def mouseMoveEvent(self, event):
+        if self.dragging:
+            self.move(event.globalPos() - self.offset)
+        elif self.shape_start is not None and event.buttons() & Qt.LeftButton:
+            end = QPointF(event.pos() - self.drawing_label.pos())
+            self.shape_preview.set_shape(self.shape_mode, self.shape_start, end, self.shape_pen())
+        elif self.last_point is not None and event.buttons() & Qt.LeftButton:
+            self.continue_stroke(event.pos() - self.drawing_label.pos(), event.timestamp())
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.dragging = False
+            if self.shape_start is not None:
+                self.shape_preview.clear()
+                end = QPointF(event.pos() - self.drawing_label.pos())
+                if self.shape_mode is not None and end != self.shape_start:
+                    self.commit_shape(self.shape_mode, self.shape_start, end)
+                self.shape_start = None
+            self.end_stroke()
+
+    def tabletEvent(self, event):
+        point = event.posF() - QPointF(self.drawing_label.pos())
+        if event.type() == QEvent.TabletPress:
+            if (self.bucket_mode or self.shape_mode is not None
+                    or not self.drawing_label.geometry().contains(event.pos())):
+                event.ignore()
+                return
+            self.begin_stroke(point, event.timestamp(), event.pressure())
+        elif event.type() == QEvent.TabletMove:
+            if self.last_point is None:
+                event.ignore()
+                return
+            self.continue_stroke(point, event.timestamp(), event.pressure())
+        elif event.type() == QEvent.TabletRelease:
+            self.end_stroke()
+        event.accept()
+
+    def begin_stroke(self, point, timestamp, pressure=None):
+        self.last_point = QPointF(point)
+        self.last_width = self.thickness_slider.value() * self.pen_dynamics.begin(point, timestamp, pressure)
+        self._stroke_started = False
+        if self.snap_button.isChecked():
+            # copy of the layer so a recognized stroke can be replaced by its shape
+            self._stroke_snapshot = self.canvas.active_layer().image.copy()
+            self.stroke_points = [QPointF(point)]
+        if self.recorder is not None:
+            self.last_point, self.last_width = self.recorder.stroke_begin(
+                self.last_point, self.last_width, self.pen.color(), self.eraser_mode,
+                self.canvas.active_index, self._stroke_snapshot is not None)
+
+    def end_stroke(self):
+        if self.last_point is not None and self.recorder is not None:
+            self.recorder.stroke_end()
+        if self.last_point is not None and self._stroke_snapshot is not None:
+            self.snap_stroke()
+        self.last_point = None
+        self._stroke_snapshot = None
+        self.stroke_points = []
+
+    def continue_stroke(self, point, timestamp, pressure=None):
+        point = QPointF(point)
+        width = self.thickness_slider.value() * self.pen_dynamics.update(point, timestamp, pressure)
+        if self.recorder is not None:
+            point, width = self.recorder.stroke_point(point, width)
+        self.draw_line(self.last_point, point, self.last_width, width)
+        self.last_point = point
+        self.last_width = width
+        if self._stroke_snapshot is not None:
+            self.stroke_points.append(point)
+
+    def update_drawing_surface(self, event):
+        if self.canvas.size() != self.drawing_label.size():
+            self.canvas.resize(self.drawing_label.size())
+            if self.recorder is not None:
+                self.recorder.resize(self.canvas.size())
+            self.shape_preview.setGeometry(self.drawing_label.rect())
+            self.refresh_canvas()
+        
+        event.accept()
+
+    def paint_drawing_surface(self, event):
+        painter = QPainter(self.drawing_label)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.fillRect(event.rect(), QColor(30, 30, 30, 20))
+        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+        painter.drawPixmap(event.rect(), self.canvas.pixmap, event.rect())
+        painter.end()
+
+    def refresh_canvas(self):
+        dirty = self.canvas.compose()
+        if not dirty.isEmpty():
+            self.drawing_label.update(dirty)
+        
+    def resizeEvent(self, event):
+        self.update_drawing_surface(event)
+        super().resizeEvent(event)
+
+    def trim(self):
+        # a hidden window gives up its canvas, brush stamps and screen grabs;
+        # the canvas is read back when the window is shown again
+        if self.isVisible() or self.recorder is not None:
+            return
+        self.stop_color_picker()
+        self.canvas.spill()
+        self.engine.brush_stamps.clear()
+        self.screen_sampler.release()
+        self._stroke_snapshot = None
+        self.region_capture = None
+        self.player = None
+
+    def closeEvent(self, event):
+        self.stop_color_picker()
+        self.stop_replay()
+        if self.recorder is not None:
+            self.record_button.setChecked(False)
+            self.toggle_recording()
+        super().closeEvent(event)
+    
+    def draw_line(self, from_point, to_point, from_width=None, to_width=None):
+        if from_width is None:
+            from_width = self.thickness_slider.value()
+        self.engine.set_tool(self.pen.color(), self.eraser_mode)
+        if self.engine.draw_line(from_point, to_point, from_width, to_width, first=not self._stroke_started):
+            self._stroke_started = True
+            self.refresh_canvas()
+
+    def clear_drawing(self):
+        self.engine.clear()
+        if self.recorder is not None:
+            self.recorder.clear()
+        self.refresh_canvas()
+
+    def bucket_fill(self, pos):
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            x, y = int(pos.x()), int(pos.y())
+            self.engine.set_tool(self.pen.color(), self.eraser_mode)
+            if not self.engine.fill(x, y):
+                return
+            if self.recorder is not None:
+                self.recorder.fill(x, y, self.pen.color(), self.eraser_mode, self.canvas.active_index)
+            self.refresh_canvas()
+        finally:
+            QApplication.restoreOverrideCursor()
@@ -0,0 +1,60 @@
+from PyQt5.QtCore import QObject
+from PyQt5.QtWidgets import QApplication
+
+
+class EventDispatcher(QObject):
+    # one application-wide filter shared by all tools. it is only installed
+    # while at least one handler is registered, so with no active tool Qt
+    # never calls back into Python for event filtering.
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls(QApplication.instance())
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._handlers = {}
+        self._installed = False
+
+    def register(self, owner, event_type, handler):
+        self._handlers.setdefault(event_type, []).append((owner, handler))
+        self._sync_installed()
+
+    def unregister(self, owner, event_type=None):
+        event_types = [event_type] if event_type is not None else list(self._handlers)
+        for current in event_types:
+            handlers = [entry for entry in self._handlers.get(current, ()) if entry[0] != owner]
+            if handlers:
+                self._handlers[current] = handlers
+            else:
+                self._handlers.pop(current, None)
+        self._sync_installed()
+
+    def is_registered(self, owner):
+        return any(entry[0] == owner for handlers in self._handlers.values() for entry in handlers)
+
+    def is_installed(self):
+        return self._installed
+
+    def _sync_installed(self):
+        app = QApplication.instance()
+        if app is None:
+            return
+        if self._handlers and not self._installed:
+            app.installEventFilter(self)
+            self._installed = True
+        elif not self._handlers and self._installed:
+            app.removeEventFilter(self)
+            self._installed = False
+
+    def eventFilter(self, obj, event):
+        handlers = self._handlers.get(event.type())
+        if not handlers:
+            return False
+        for owner, handler in tuple(handlers):
+            if handler(event):
+                return True
+        return False
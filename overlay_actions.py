@@ -0,0 +1,171 @@
+import os
+import sys
+import json
+import importlib
+import traceback
+from importlib import metadata
+
+ENTRY_POINT_GROUP = "actionoverlay.actions"
+CONFIG_FILE = "actions.json"
+
+DEFAULT_COLORS = ("#2c2c2c", "#3a3a3a", "#1e1e1e", "#444")
+
+# used when there is no actions.json next to the program
+DEFAULT_ACTIONS = [
+    {"name": "copy", "label": "copy", "target": "actions.shortcut:ShortcutAction", "args": {"key": "C"}},
+    {"name": "paste", "label": "paste", "target": "actions.shortcut:ShortcutAction", "args": {"key": "V"}},
+    {"name": "cut", "label": "cut", "target": "actions.shortcut:ShortcutAction", "args": {"key": "X"}},
+    {"name": "duplicate", "label": "duplicate", "target": "actions.shortcut:ShortcutAction", "args": {"key": "D"}},
+    {"name": "select all", "label": "select all", "target": "actions.shortcut:ShortcutAction", "args": {"key": "A"}},
+    {"name": "undo", "label": "undo", "target": "actions.shortcut:ShortcutAction", "args": {"key": "Z"}},
+    {"name": "redo", "label": "redo", "target": "actions.shortcut:ShortcutAction", "args": {"key": "Y"}},
+    {"name": "apps", "label": "apps", "target": "actions.apps:AppsAction",
+     "colors": ["#1a1a1a", "#333333", "#595959", "#0d0d0d"]},
+    {"name": "print screen", "label": "⌜⌟ print screen", "target": "actions.print_screen:PrintScreenAction",
+     "colors": ["#286", "#3a8", "#174", "#063"]},
+    {"name": "draw", "label": "✎ draw", "target": "actions.draw:DrawAction",
+     "colors": ["#228", "#33a", "#116", "#006"]},
+    {"name": "quit", "label": "✖ quit", "target": "actions.quit:QuitAction",
+     "colors": ["#922", "#b33", "#811", "#600"]},
+]
+
+
+def button_style(colors):
+    background, hover, pressed, border = colors
+    return f"""
+        QPushButton {{
+            background-color: {background};
+            padding: 5px;
+            color: #fff;
+            border: 1px solid {border};
+            border-radius: 10px;
+        }}
+        QPushButton:hover {{
+            background-color: {hover};
+        }}
+        QPushButton:pressed {{
+            background-color: {pressed};
+        }}
+    """
+
+
+class OverlayAction:
+    def __init__(self, overlay, button):
+        self.overlay = overlay
+        self.button = button
+
+    def trigger(self):
+        raise NotImplementedError
+
+    def collapse(self):
+        pass
+
+    def attach(self, button):
+        # the overlay rebuilds its buttons after an idle trim
+        self.button = button
+
+    def trim(self):
+        # called after the overlay sat collapsed for a while, drop anything
+        # that can be rebuilt on the next trigger
+        pass
+
+
+class ActionEntry:
+    def __init__(self, name, label, target=None, args=None, colors=None, entry_point=None):
+        self.name = name
+        self.label = label
+        self.target = target
+        self.args = args or {}
+        self.colors = tuple(colors) if colors else DEFAULT_COLORS
+        self.entry_point = entry_point
+        self.action = None
+        self.error = None
+
+    def load(self):
+        # the action module is only imported here, on the first click
+        if self.entry_point is not None:
+            return self.entry_point.load()
+        module_name, _, attr = self.target.partition(":")
+        return getattr(importlib.import_module(module_name), attr)
+
+    def activate(self, overlay, button):
+        # an exception escaping a Qt slot aborts the overlay, so a broken
+        # plugin or config line only disables its own button
+        if self.action is None:
+            try:
+                self.action = self.load()(overlay, button, **self.args)
+            except Exception as error:
+                self.fail(button, f"could not load action '{self.name}'", error)
+                return
+        try:
+            self.action.trigger()
+        except Exception as error:
+            self.report(f"action '{self.name}' failed", error)
+
+    def report(self, message, error):
+        print(f"actionOverlay: {message}: {error}", file=sys.stderr)
+        traceback.print_exception(type(error), error, error.__traceback__)
+
+    def fail(self, button, message, error):
+        self.error = f"{message}: {error}"
+        self.report(message, error)
+        self.disable(button)
+
+    def disable(self, button):
+        button.setEnabled(False)
+        button.setToolTip(self.error)
+
+
+def config_path():
+    if getattr(sys, "frozen", False):
+        base = os.path.dirname(sys.executable)
+    else:
+        base = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base, CONFIG_FILE)
+
+
+def plugin_entry_points():
+    entry_points = metadata.entry_points()
+    if hasattr(entry_points, "select"):
+        return list(entry_points.select(group=ENTRY_POINT_GROUP))
+    return list(entry_points.get(ENTRY_POINT_GROUP, []))
+
+
+def check_definition(definition, index, path):
+    # malformed entries stop the overlay at startup with the offending line
+    # instead of failing on the first click
+    where = f"{path}: action {index}"
+    if not isinstance(definition, dict):
+        raise ValueError(f"{where} must be an object")
+    if not isinstance(definition.get("name"), str) or not definition["name"]:
+        raise ValueError(f"{where} needs a \"name\"")
+    target = definition.get("target")
+    module_name, _, attr = target.partition(":") if isinstance(target, str) else ("", "", "")
+    if not module_name or not attr or not all(part.isidentifier() for part in module_name.split(".")) \
+            or not attr.isidentifier():
+        raise ValueError(f"{where} ({definition['name']}) needs a \"target\" like \"package.module:ClassName\", "
+                         f"got {target!r}")
+    if not isinstance(definition.get("args", {}), dict):
+        raise ValueError(f"{where} ({definition['name']}) \"args\" must be an object")
+
+
+def load_action_entries(path=None):
+    path = path or config_path()
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as config:
+            definitions = json.load(config)
+        if not isinstance(definitions, list):
+            raise ValueError(f"{path} must contain a list of actions")
+    else:
+        definitions = DEFAULT_ACTIONS
+    for index, definition in enumerate(definitions):
+        check_definition(definition, index, path)
+    entries = [
+        ActionEntry(d["name"], d.get("label", d["name"]), d["target"], d.get("args"), d.get("colors"))
+        for d in definitions
+    ]
+    plugins = [ActionEntry(ep.name, ep.name, entry_point=ep) for ep in plugin_entry_points()]
+    # installed plugins go above quit so it stays the last button
+    if entries and entries[-1].name == "quit":
+        return entries[:-1] + plugins + entries[-1:]
+    return entries + plugins
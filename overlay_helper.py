@@ -0,0 +1,455 @@
+import os
+import sys
+import time
+import queue
+import socket
+import struct
+import threading
+import traceback
+import subprocess
+
+# every frame is a 1 byte opcode and a 2 byte payload length followed by the
+# payload; only OP_PING is answered, everything else is fire-and-forget
+HEADER = struct.Struct("<BH")
+
+OP_NOOP = 0
+OP_HOTKEY = 1
+OP_KEY_DOWN = 2
+OP_KEY_UP = 3
+OP_PRESS = 4
+OP_SLEEP = 5
+OP_SHOW_WINDOW = 6
+OP_SET_WINDOW_POS = 7
+OP_SET_FOREGROUND = 8
+OP_POST_MESSAGE = 9
+OP_PLACE_WINDOWS = 10
+OP_PING = 255
+
+SLEEP = struct.Struct("<H")
+SHOW_WINDOW = struct.Struct("<qi")
+SET_WINDOW_POS = struct.Struct("<qqiiiiI")
+HWND = struct.Struct("<q")
+POST_MESSAGE = struct.Struct("<qIqq")
+PLACEMENT = struct.Struct("<qiiii")
+PLACE_FLAGS = struct.Struct("<I")
+PING = struct.Struct("<I")
+
+HELPER_ARG = "--overlay-helper"
+
+# SetWindowPos flag that only posts the request to the window's thread, so a
+# hung window can not block the caller
+SWP_ASYNCWINDOWPOS = 0x4000
+
+# queued by the reader when the helper hangs up, wakes the writer so a dead
+# helper is restarted even while nothing else is being sent
+_CHECK_HELPER = b""
+
+
+def frame(op, payload=b""):
+    return HEADER.pack(op, len(payload)) + payload
+
+
+def report_failure(op):
+    # commands are fire-and-forget, a failure is only written to stderr
+    print(f"overlay helper: command {op} failed", file=sys.stderr)
+    traceback.print_exc()
+
+
+def defer_window_positions(placements, flags):
+    import ctypes
+    import win32gui
+    user32 = ctypes.windll.user32
+    user32.BeginDeferWindowPos.restype = ctypes.c_void_p
+    user32.DeferWindowPos.restype = ctypes.c_void_p
+    user32.DeferWindowPos.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int,
+                                      ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_uint]
+    user32.EndDeferWindowPos.argtypes = [ctypes.c_void_p]
+    # all windows are moved in one DeferWindowPos batch; if the batch can
+    # not be built every window falls back to an asynchronous SetWindowPos
+    hdwp = user32.BeginDeferWindowPos(len(placements))
+    for hwnd, x, y, width, height in placements:
+        if hdwp:
+            hdwp = user32.DeferWindowPos(hdwp, hwnd, None, x, y, width, height, flags)
+        if not hdwp:
+            for hwnd, x, y, width, height in placements:
+                win32gui.SetWindowPos(hwnd, 0, x, y, width, height, flags | SWP_ASYNCWINDOWPOS)
+            return
+    user32.EndDeferWindowPos(hdwp)
+
+
+def execute(op, payload):
+    # platform modules are imported on first use so the helper (and the
+    # ping benchmark) also run where pyautogui or pywin32 are missing
+    if op == OP_NOOP or op == OP_PING:
+        return
+    if op in (OP_HOTKEY, OP_KEY_DOWN, OP_KEY_UP, OP_PRESS):
+        import pyautogui
+        text = payload.decode("utf-8")
+        if op == OP_HOTKEY:
+            pyautogui.hotkey(*text.split("+"))
+        elif op == OP_KEY_DOWN:
+            pyautogui.keyDown(text)
+        elif op == OP_KEY_UP:
+            pyautogui.keyUp(text)
+        else:
+            pyautogui.press(text)
+    elif op == OP_SLEEP:
+        time.sleep(SLEEP.unpack(payload)[0] / 1000)
+    elif op == OP_PLACE_WINDOWS:
+        flags = PLACE_FLAGS.unpack_from(payload)[0]
+        placements = [PLACEMENT.unpack_from(payload, offset)
+                      for offset in range(PLACE_FLAGS.size, len(payload), PLACEMENT.size)]
+        defer_window_positions(placements, flags)
+    elif op == OP_SHOW_WINDOW:
+        import ctypes
+        # ShowWindow waits for the target's thread, ShowWindowAsync does not
+        ctypes.windll.user32.ShowWindowAsync(*SHOW_WINDOW.unpack(payload))
+    else:
+        import win32gui
+        if op == OP_SET_WINDOW_POS:
+            hwnd, insert_after, x, y, width, height, flags = SET_WINDOW_POS.unpack(payload)
+            win32gui.SetWindowPos(hwnd, insert_after, x, y, width, height, flags | SWP_ASYNCWINDOWPOS)
+        elif op == OP_SET_FOREGROUND:
+            win32gui.SetForegroundWindow(*HWND.unpack(payload))
+        elif op == OP_POST_MESSAGE:
+            win32gui.PostMessage(*POST_MESSAGE.unpack(payload))
+
+
+def read_exact(sock, size):
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("connection closed")
+        data += chunk
+    return data
+
+
+def serve(port):
+    sock = socket.create_connection(("127.0.0.1", port))
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    buffer = b""
+    while True:
+        try:
+            chunk = sock.recv(65536)
+        except OSError:
+            # the overlay closed the connection or exited
+            return
+        if not chunk:
+            return
+        buffer += chunk
+        offset = 0
+        while len(buffer) - offset >= HEADER.size:
+            op, length = HEADER.unpack_from(buffer, offset)
+            end = offset + HEADER.size + length
+            if end > len(buffer):
+                break
+            payload = buffer[offset + HEADER.size:end]
+            offset = end
+            if op == OP_PING:
+                try:
+                    sock.sendall(frame(OP_PING, payload))
+                except OSError:
+                    return
+                continue
+            try:
+                execute(op, payload)
+            except Exception:
+                report_failure(op)
+        buffer = buffer[offset:]
+
+
+class HelperClient:
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self, command=None, connect_timeout=5.0, hang_timeout=3.0):
+        self.command = command
+        self.connect_timeout = connect_timeout
+        # a helper that has not answered the ping sent after a batch within
+        # this many seconds (plus any sleeps in the batch) is killed and
+        # replaced, so a call stuck on a hung window can not stall the queue
+        self.hang_timeout = hang_timeout
+        self.restarts = 0
+        self.hangs = 0
+        self.in_process = False
+        self._process = None
+        self._sock = None
+        self._lost_sock = None
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pings = {}
+        self._ping_seq = 0
+        self._writer = None
+        self._watchdog = None
+        self._watches = queue.Queue()
+        self._busy_until = 0.0
+        self._stopped = False
+
+    def helper_command(self, port):
+        if self.command is not None:
+            return list(self.command) + [str(port)]
+        if getattr(sys, "frozen", False):
+            return [sys.executable, HELPER_ARG, str(port)]
+        return [sys.executable, os.path.abspath(__file__), str(port)]
+
+    def start(self):
+        if self._writer is not None:
+            return
+        self._stopped = False
+        self._writer = threading.Thread(target=self._write_loop, name="overlay-helper-writer", daemon=True)
+        self._writer.start()
+        self._watchdog = threading.Thread(target=self._watch_loop, name="overlay-helper-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        self._stopped = True
+        self._queue.put(None)
+        self._watches.put(None)
+        if self._writer is not None:
+            self._writer.join(1.0)
+            self._writer = None
+        if self._watchdog is not None:
+            self._watchdog.join(1.0)
+            self._watchdog = None
+        self._close()
+
+    def _spawn(self):
+        self._close()
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            listener.bind(("127.0.0.1", 0))
+            listener.listen(1)
+            listener.settimeout(self.connect_timeout)
+            flags = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+            self._process = subprocess.Popen(self.helper_command(listener.getsockname()[1]), creationflags=flags)
+            sock, _ = listener.accept()
+        except (OSError, socket.timeout):
+            # no helper could be started, run commands on the writer thread
+            # instead so the gui thread still never blocks on them
+            self._close()
+            self.in_process = True
+            return
+        finally:
+            listener.close()
+        sock.settimeout(None)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock = sock
+        self.in_process = False
+        threading.Thread(target=self._read_loop, args=(sock,), name="overlay-helper-reader", daemon=True).start()
+
+    def pid(self):
+        # None until the writer thread has spawned the helper, or when
+        # commands run in this process
+        process = self._process
+        return process.pid if process is not None else None
+
+    def _close(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+        if self._process is not None:
+            if self._process.poll() is None:
+                self._process.kill()
+            self._process = None
+
+    def _write_loop(self):
+        # spawning happens here so starting the client never blocks the caller
+        self._spawn()
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            # pipeline everything that queued up meanwhile into one write
+            batch = [item]
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            self._ensure_alive()
+            batch = [data for data in batch if data]
+            if batch:
+                self._allow_foreground(batch)
+                self._flush(batch)
+
+    def _ensure_alive(self):
+        if self.in_process or self._stopped:
+            return
+        # the reader hangs up before poll() sees the process exit
+        if (self._sock is None or self._sock is self._lost_sock
+                or (self._process is not None and self._process.poll() is not None)):
+            self.restarts += 1
+            self._spawn()
+
+    def _allow_foreground(self, batch):
+        # the helper is a background process, let it take the foreground;
+        # done here because only the writer knows the helper's real pid
+        if sys.platform != "win32" or self.in_process or self._process is None:
+            return
+        if any(data[0] == OP_SET_FOREGROUND for data in batch):
+            import ctypes
+            ctypes.windll.user32.AllowSetForegroundWindow(self._process.pid)
+
+    def _watch_batch(self, batch):
+        # a ping after the batch is answered once the helper executed it
+        sleeps = sum(SLEEP.unpack_from(data, HEADER.size)[0] / 1000 for data in batch if data[0] == OP_SLEEP)
+        now = time.monotonic()
+        self._busy_until = max(self._busy_until, now) + sleeps
+        event = threading.Event()
+        with self._lock:
+            self._ping_seq = (self._ping_seq + 1) & 0xFFFFFFFF
+            seq = self._ping_seq
+            self._pings[seq] = event
+        self._watches.put((event, seq, self._busy_until + self.hang_timeout, self._process))
+        return frame(OP_PING, PING.pack(seq))
+
+    def _watch_loop(self):
+        # pings are answered in order, so waiting on them one by one is enough
+        while True:
+            watch = self._watches.get()
+            if watch is None:
+                return
+            event, seq, deadline, process = watch
+            if event.wait(max(0.0, deadline - time.monotonic())) or self._stopped:
+                continue
+            with self._lock:
+                self._pings.pop(seq, None)
+            if process is None or process.poll() is not None:
+                continue
+            self.hangs += 1
+            print(f"overlay helper: no answer within {self.hang_timeout:.1f} s, restarting it", file=sys.stderr)
+            process.kill()
+            try:
+                process.wait(1.0)
+            except subprocess.TimeoutExpired:
+                pass
+            # the writer replaces the dead helper before its next batch;
+            # whatever was already sent to the hung one is dropped
+            self._queue.put(_CHECK_HELPER)
+
+    def _flush(self, batch):
+        if self.in_process:
+            for data in batch:
+                op, length = HEADER.unpack_from(data)
+                if op == OP_PING:
+                    self._resolve_ping(data[HEADER.size:])
+                    continue
+                try:
+                    execute(op, data[HEADER.size:HEADER.size + length])
+                except Exception:
+                    report_failure(op)
+            return
+        if any(data[0] != OP_PING for data in batch):
+            batch = batch + [self._watch_batch(batch)]
+        data = b"".join(batch)
+        # the socket is None when the helper never came up or was closed
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.sendall(data)
+                return
+            except OSError:
+                pass
+        if self._stopped:
+            return
+        # the helper died, restart it and resend this batch once
+        self.restarts += 1
+        self._spawn()
+        if self._sock is None:
+            self._flush(batch)
+            return
+        try:
+            self._sock.sendall(data)
+        except OSError:
+            pass
+
+    def _read_loop(self, sock):
+        try:
+            while True:
+                op, length = HEADER.unpack(read_exact(sock, HEADER.size))
+                payload = read_exact(sock, length)
+                if op == OP_PING:
+                    self._resolve_ping(payload)
+        except (OSError, ConnectionError):
+            pass
+        if not self._stopped:
+            self._lost_sock = sock
+            self._queue.put(_CHECK_HELPER)
+
+    def _resolve_ping(self, payload):
+        with self._lock:
+            event = self._pings.pop(PING.unpack(payload)[0], None)
+        if event is not None:
+            event.set()
+
+    def send(self, op, payload=b""):
+        if self._writer is None:
+            self.start()
+        self._queue.put(frame(op, payload))
+
+    def hotkey(self, *keys):
+        self.send(OP_HOTKEY, "+".join(keys).encode("utf-8"))
+
+    def key_down(self, key):
+        self.send(OP_KEY_DOWN, key.encode("utf-8"))
+
+    def key_up(self, key):
+        self.send(OP_KEY_UP, key.encode("utf-8"))
+
+    def press(self, key):
+        self.send(OP_PRESS, key.encode("utf-8"))
+
+    def sleep(self, seconds):
+        self.send(OP_SLEEP, SLEEP.pack(int(seconds * 1000)))
+
+    def show_window(self, hwnd, command):
+        self.send(OP_SHOW_WINDOW, SHOW_WINDOW.pack(hwnd, command))
+
+    def set_window_pos(self, hwnd, insert_after, x, y, width, height, flags):
+        self.send(OP_SET_WINDOW_POS, SET_WINDOW_POS.pack(hwnd, insert_after, x, y, width, height, flags))
+
+    def set_foreground(self, hwnd):
+        self.send(OP_SET_FOREGROUND, HWND.pack(hwnd))
+
+    def post_message(self, hwnd, message, wparam=0, lparam=0):
+        self.send(OP_POST_MESSAGE, POST_MESSAGE.pack(hwnd, message, wparam, lparam))
+
+    def place_windows(self, placements, flags):
+        payload = PLACE_FLAGS.pack(flags) + b"".join(
+            PLACEMENT.pack(hwnd, rect.x(), rect.y(), rect.width(), rect.height()) for hwnd, rect in placements)
+        self.send(OP_PLACE_WINDOWS, payload)
+
+    def ping(self, timeout=1.0):
+        event = threading.Event()
+        with self._lock:
+            self._ping_seq = (self._ping_seq + 1) & 0xFFFFFFFF
+            seq = self._ping_seq
+            self._pings[seq] = event
+        start = time.perf_counter()
+        self.send(OP_PING, PING.pack(seq))
+        if not event.wait(timeout):
+            with self._lock:
+                self._pings.pop(seq, None)
+            return None
+        return time.perf_counter() - start
+
+
+def main(argv):
+    serve(int(argv[-1]))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,161 @@
+import os
+import time
+import datetime
+from PyQt5.QtCore import Qt, QEvent, QRect, QTimer, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor, QPen, QImage
+from PyQt5.QtWidgets import QApplication, QWidget
+from event_dispatch import EventDispatcher
+from screen_manager import ScreenManager
+
+
+def screenshot_path(directory):
+    # millisecond names plus a counter; the file is created right away so a
+    # second capture can not pick the same name while the first one is
+    # still being encoded on the thread pool
+    now = datetime.datetime.now()
+    stamp = f"{now:%Y-%m-%d_%H-%M-%S}-{now.microsecond // 1000:03d}"
+    path = os.path.join(directory, f"screenshot_{stamp}.png")
+    counter = 1
+    while True:
+        try:
+            open(path, "x").close()
+            return path
+        except FileExistsError:
+            path = os.path.join(directory, f"screenshot_{stamp}_{counter}.png")
+            counter += 1
+
+
+class SaveImageTask(QRunnable):
+    def __init__(self, image, file_path):
+        super().__init__()
+        self.image = image
+        self.file_path = file_path
+
+    def run(self):
+        self.image.save(self.file_path, "PNG")
+
+
+class RegionCapture(QWidget):
+    captured = pyqtSignal(QImage)
+    cancelled = pyqtSignal()
+
+    def __init__(self, layer=None, layer_origin=None, copy_to_clipboard=True, save_dir=None,
+                 hide_windows=(), settle_ms=30):
+        super().__init__()
+        self.setWindowTitle("actionOverlay - Region Capture")
+        self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint | Qt.Tool)
+        self.setAttribute(Qt.WA_TranslucentBackground, True)
+        self.setCursor(Qt.CrossCursor)
+
+        self.layer = layer
+        self.layer_origin = layer_origin
+        self.copy_to_clipboard = copy_to_clipboard
+        self.save_dir = save_dir
+        self.hide_windows = list(hide_windows)
+        self.settle_ms = settle_ms
+
+        self._hidden = []
+        self._screen = None
+        self._origin = None
+        self._selection = QRect()
+        self._released_at = None
+        self.last_latency_ms = None
+        self.last_file_path = None
+
+    def start(self):
+        info = ScreenManager.instance().info_at_cursor()
+        if not info:
+            self.cancelled.emit()
+            return
+        self._screen = info.screen
+        for window in self.hide_windows:
+            if window.isVisible():
+                window.hide()
+                self._hidden.append(window)
+        # the capture window is a tool window and may not get keyboard focus
+        EventDispatcher.instance().register(self, QEvent.KeyPress, self.on_key)
+        self.setGeometry(info.geometry)
+        self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor(0, 0, 0, 80))
+        if not self._selection.isNull():
+            local = self._selection.translated(-self.geometry().topLeft())
+            # alpha 1 instead of 0 so the selection stays clickable on Windows
+            painter.setCompositionMode(QPainter.CompositionMode_Source)
+            painter.fillRect(local, QColor(0, 0, 0, 1))
+            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
+            painter.setPen(QPen(QColor("#2196F3"), 2))
+            painter.drawRect(local.adjusted(0, 0, -1, -1))
+        painter.end()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._origin = event.globalPos()
+            self._selection = QRect(self._origin, self._origin)
+            self.update()
+        elif event.button() == Qt.RightButton:
+            self.cancel()
+
+    def mouseMoveEvent(self, event):
+        if self._origin is not None:
+            old = self._selection
+            self._selection = QRect(self._origin, event.globalPos()).normalized()
+            self.update(old.united(self._selection).translated(-self.geometry().topLeft()).adjusted(-2, -2, 2, 2))
+
+    def mouseReleaseEvent(self, event):
+        if event.button() != Qt.LeftButton or self._origin is None:
+            return
+        region = QRect(self._origin, event.globalPos()).normalized()
+        self._origin = None
+        if region.width() < 3 or region.height() < 3:
+            self.cancel()
+            return
+        self._released_at = time.perf_counter()
+        self.hide()
+        QTimer.singleShot(self.settle_ms, lambda: self.finish(region))
+
+    def on_key(self, event):
+        if event.key() == Qt.Key_Escape:
+            self.cancel()
+            return True
+        return False
+
+    def grab_region(self, region):
+        screen = self._screen or QApplication.primaryScreen()
+        pixmap = screen.grabWindow(0, region.x(), region.y(), region.width(), region.height())
+        if self.layer is not None and self.layer_origin is not None and not self.layer.isNull():
+            painter = QPainter(pixmap)
+            painter.drawPixmap(self.layer_origin - region.topLeft(), self.layer)
+            painter.end()
+        return pixmap.toImage()
+
+    def finish(self, region):
+        image = self.grab_region(region)
+        if self.copy_to_clipboard:
+            QApplication.clipboard().setImage(image)
+        if self.save_dir:
+            os.makedirs(self.save_dir, exist_ok=True)
+            self.last_file_path = screenshot_path(self.save_dir)
+            QThreadPool.globalInstance().start(SaveImageTask(image, self.last_file_path))
+        if self._released_at is not None:
+            self.last_latency_ms = (time.perf_counter() - self._released_at) * 1000
+        self.restore_windows()
+        self.captured.emit(image)
+        self.close()
+
+    def cancel(self):
+        self._origin = None
+        self.hide()
+        self.restore_windows()
+        self.cancelled.emit()
+        self.close()
+
+    def restore_windows(self):
+        EventDispatcher.instance().unregister(self)
+        for window in self._hidden:
+            window.show()
+        self._hidden = []
@@ -0,0 +1,95 @@
+from PyQt5.QtCore import QObject, QRect, pyqtSignal
+from PyQt5.QtGui import QCursor
+from PyQt5.QtWidgets import QApplication
+
+
+class ScreenInfo:
+    def __init__(self, screen):
+        self.screen = screen
+        self.name = screen.name()
+        self.geometry = screen.geometry()
+        self.available_geometry = screen.availableGeometry()
+        self.dpi = screen.logicalDotsPerInch()
+        self.device_pixel_ratio = screen.devicePixelRatio()
+        # qt keeps the native top-left of a screen and scales only its size
+        self.native_geometry = self.to_native(self.geometry)
+        self.native_available_geometry = self.to_native(self.available_geometry)
+
+    def to_native(self, rect):
+        ratio = self.device_pixel_ratio
+        origin = self.geometry.topLeft()
+        return QRect(
+            origin.x() + round((rect.x() - origin.x()) * ratio),
+            origin.y() + round((rect.y() - origin.y()) * ratio),
+            round(rect.width() * ratio),
+            round(rect.height() * ratio),
+        )
+
+    def centered(self, width, height, available=True):
+        area = self.available_geometry if available else self.geometry
+        width = min(width, area.width())
+        height = min(height, area.height())
+        return QRect(area.x() + (area.width() - width) // 2, area.y() + (area.height() - height) // 2, width, height)
+
+
+class ScreenManager(QObject):
+    screens_changed = pyqtSignal()
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = cls(QApplication.instance())
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._infos = {}
+        app = QApplication.instance()
+        app.screenAdded.connect(self._add_screen)
+        app.screenRemoved.connect(self._remove_screen)
+        app.primaryScreenChanged.connect(lambda _: self.screens_changed.emit())
+        for screen in app.screens():
+            self._add_screen(screen)
+
+    def _add_screen(self, screen):
+        refresh = lambda *_: self._refresh(screen)
+        screen.geometryChanged.connect(refresh)
+        screen.availableGeometryChanged.connect(refresh)
+        screen.logicalDotsPerInchChanged.connect(refresh)
+        screen.physicalDotsPerInchChanged.connect(refresh)
+        self._refresh(screen)
+
+    def _remove_screen(self, screen):
+        self._infos.pop(screen, None)
+        self.screens_changed.emit()
+
+    def _refresh(self, screen):
+        self._infos[screen] = ScreenInfo(screen)
+        self.screens_changed.emit()
+
+    def screens(self):
+        return list(self._infos.values())
+
+    def info(self, screen):
+        info = self._infos.get(screen)
+        if info is None and screen is not None:
+            self._add_screen(screen)
+            info = self._infos[screen]
+        return info
+
+    def info_at(self, pos):
+        for info in self._infos.values():
+            if info.geometry.contains(pos):
+                return info
+        return self.info(QApplication.primaryScreen())
+
+    def info_at_cursor(self):
+        return self.info_at(QCursor.pos())
+
+    def move_widget_to_screen(self, widget, info=None, available=True):
+        info = info or self.info_at_cursor()
+        if info is None:
+            return
+        widget.setGeometry(info.available_geometry if available else info.geometry)
@@ -0,0 +1,474 @@
+import os
+import sys
+import time
+import zlib
+from PyQt5.QtCore import Qt, QObject, QPointF, QSize, QTimer, QElapsedTimer, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QPainter, QColor, QImage, QRegion
+from canvas_layers import LayeredCanvas
+from drawing_engine import DrawingEngine
+from shapes import SHAPES
+from region_capture import SaveImageTask
+
+MAGIC = b"AOSR"
+VERSION = 1
+
+# every event is an opcode byte, the milliseconds since the previous event as
+# a varint and the payload; coordinates and widths are stored in 1/8 px and
+# stroke points only as the difference to the previous point; the recording
+# methods return the rounded values so the window draws exactly what a replay
+# will draw
+EV_RESIZE = 1
+EV_TOOL = 2
+EV_LAYER = 3
+EV_LAYER_STATE = 4
+EV_LAYER_IMAGE = 5
+EV_STROKE_BEGIN = 6
+EV_STROKE_POINT = 7
+EV_STROKE_END = 8
+EV_RESTORE = 9
+EV_SHAPE = 10
+EV_FILL = 11
+EV_CLEAR = 12
+
+SCALE = 8
+SNAPSHOT = 1
+
+SESSION_FILTER = "Drawing Sessions (*.aosr)"
+
+
+def write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def write_signed(buffer, value):
+    write_varint(buffer, (value << 1) if value >= 0 else ((-value << 1) - 1))
+
+
+def read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("truncated drawing session")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def read_signed(data, offset):
+    value, offset = read_varint(data, offset)
+    return (value >> 1) if not value & 1 else -((value + 1) >> 1), offset
+
+
+class SessionRecorder:
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.buffer = bytearray(MAGIC)
+        self.buffer.append(VERSION)
+        write_varint(self.buffer, len(canvas.layers))
+        for layer in canvas.layers:
+            name = layer.name.encode("utf-8")
+            write_varint(self.buffer, len(name))
+            self.buffer += name
+        self.events = 0
+        self._start_ns = time.monotonic_ns()
+        self._last_ms = 0
+        self._tool = None
+        self._layer = None
+        self._last_x = 0
+        self._last_y = 0
+        self._last_width = 0
+
+        # the session starts from whatever is on the canvas right now
+        self.resize(canvas.size())
+        for index, layer in enumerate(canvas.layers):
+            self.layer_state(index, layer.visible, layer.opacity)
+            blank = QImage(layer.image.size(), layer.image.format())
+            blank.fill(Qt.transparent)
+            if layer.image != blank:
+                self.layer_image(index, layer.image)
+
+    def _event(self, op):
+        now_ms = (time.monotonic_ns() - self._start_ns) // 1000000
+        self.buffer.append(op)
+        write_varint(self.buffer, now_ms - self._last_ms)
+        self._last_ms = now_ms
+        self.events += 1
+
+    def _tool_state(self, color, eraser, layer_index):
+        # tool and layer changes are only written when something is drawn
+        # with them, so the buttons themselves need no hooks
+        tool = (QColor(color).rgba(), eraser)
+        if tool != self._tool:
+            self._tool = tool
+            self._event(EV_TOOL)
+            self.buffer += tool[0].to_bytes(4, "little")
+            self.buffer.append(1 if eraser else 0)
+        if layer_index != self._layer:
+            self._layer = layer_index
+            self._event(EV_LAYER)
+            self.buffer.append(layer_index)
+
+    def resize(self, size):
+        self._event(EV_RESIZE)
+        write_varint(self.buffer, size.width())
+        write_varint(self.buffer, size.height())
+
+    def layer_state(self, index, visible, opacity):
+        self._event(EV_LAYER_STATE)
+        self.buffer.append(index)
+        self.buffer.append(1 if visible else 0)
+        self.buffer.append(int(round(opacity * 100)))
+
+    def layer_image(self, index, image):
+        # raw premultiplied pixels, a png round trip would change
+        # half transparent pixels
+        image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        data = zlib.compress(image.constBits().asstring(image.sizeInBytes()), 1)
+        self._event(EV_LAYER_IMAGE)
+        self.buffer.append(index)
+        write_varint(self.buffer, image.width())
+        write_varint(self.buffer, image.height())
+        write_varint(self.buffer, len(data))
+        self.buffer += data
+
+    def stroke_begin(self, point, width, color, eraser, layer_index, snapshot=False):
+        self._tool_state(color, eraser, layer_index)
+        self._last_x = int(round(point.x() * SCALE))
+        self._last_y = int(round(point.y() * SCALE))
+        self._last_width = int(round(width * SCALE))
+        self._event(EV_STROKE_BEGIN)
+        write_signed(self.buffer, self._last_x)
+        write_signed(self.buffer, self._last_y)
+        write_varint(self.buffer, self._last_width)
+        self.buffer.append(SNAPSHOT if snapshot else 0)
+        return QPointF(self._last_x / SCALE, self._last_y / SCALE), self._last_width / SCALE
+
+    def stroke_point(self, point, width):
+        # hot path, called for every pointer move while drawing
+        x = round(point.x() * SCALE)
+        y = round(point.y() * SCALE)
+        w = round(width * SCALE)
+        now_ms = (time.monotonic_ns() - self._start_ns) // 1000000
+        buffer = self.buffer
+        buffer.append(EV_STROKE_POINT)
+        write_varint(buffer, now_ms - self._last_ms)
+        for value in (x - self._last_x, y - self._last_y, w - self._last_width):
+            value = (value << 1) if value >= 0 else ((-value << 1) - 1)
+            if value < 0x80:
+                buffer.append(value)
+            else:
+                write_varint(buffer, value)
+        self._last_ms = now_ms
+        self.events += 1
+        self._last_x = x
+        self._last_y = y
+        self._last_width = w
+        return QPointF(x / SCALE, y / SCALE), w / SCALE
+
+    def stroke_end(self):
+        self._event(EV_STROKE_END)
+
+    def restore(self):
+        self._event(EV_RESTORE)
+
+    def shape(self, kind, start, end, width, color, eraser, layer_index):
+        self._tool_state(color, eraser, layer_index)
+        self._event(EV_SHAPE)
+        self.buffer.append(SHAPES.index(kind))
+        values = [int(round(value * SCALE)) for value in (start.x(), start.y(), end.x(), end.y())]
+        for value in values:
+            write_signed(self.buffer, value)
+        write_varint(self.buffer, int(round(width * SCALE)))
+        return QPointF(values[0] / SCALE, values[1] / SCALE), QPointF(values[2] / SCALE, values[3] / SCALE)
+
+    def fill(self, x, y, color, eraser, layer_index):
+        self._tool_state(color, eraser, layer_index)
+        self._event(EV_FILL)
+        write_varint(self.buffer, x)
+        write_varint(self.buffer, y)
+
+    def clear(self):
+        self._event(EV_CLEAR)
+
+    def data(self):
+        return bytes(self.buffer)
+
+
+def read_bytes(data, offset, length):
+    end = offset + length
+    if end > len(data):
+        raise ValueError("truncated drawing session")
+    return data[offset:end], end
+
+
+def read_layer_index(data, offset, names):
+    index, offset = read_bytes(data, offset, 1)
+    if index[0] >= len(names):
+        raise ValueError(f"drawing session refers to missing layer {index[0]}")
+    return index[0], offset
+
+
+def decode(data):
+    # raises ValueError for anything that is not a complete session
+    if data[:4] != MAGIC:
+        raise ValueError("not a drawing session")
+    if len(data) < 5:
+        raise ValueError("truncated drawing session")
+    if data[4] != VERSION:
+        raise ValueError(f"unsupported drawing session version {data[4]}")
+    offset = 5
+    count, offset = read_varint(data, offset)
+    names = []
+    for _ in range(count):
+        length, offset = read_varint(data, offset)
+        name, offset = read_bytes(data, offset, length)
+        names.append(name.decode("utf-8", "replace"))
+
+    events = []
+    now = 0
+    x = y = width = 0
+    end = len(data)
+    while offset < end:
+        op = data[offset]
+        delta, offset = read_varint(data, offset + 1)
+        now += delta
+        if op == EV_STROKE_POINT:
+            dx, offset = read_signed(data, offset)
+            dy, offset = read_signed(data, offset)
+            dw, offset = read_signed(data, offset)
+            x += dx
+            y += dy
+            width += dw
+            args = (QPointF(x / SCALE, y / SCALE), width / SCALE)
+        elif op == EV_STROKE_BEGIN:
+            x, offset = read_signed(data, offset)
+            y, offset = read_signed(data, offset)
+            width, offset = read_varint(data, offset)
+            flags, offset = read_bytes(data, offset, 1)
+            flags = flags[0]
+            args = (QPointF(x / SCALE, y / SCALE), width / SCALE, bool(flags & SNAPSHOT))
+        elif op == EV_RESIZE:
+            w, offset = read_varint(data, offset)
+            h, offset = read_varint(data, offset)
+            args = (QSize(w, h),)
+        elif op == EV_TOOL:
+            tool, offset = read_bytes(data, offset, 5)
+            args = (QColor.fromRgba(int.from_bytes(tool[:4], "little")), bool(tool[4]))
+        elif op == EV_LAYER:
+            index, offset = read_layer_index(data, offset, names)
+            args = (index,)
+        elif op == EV_LAYER_STATE:
+            index, offset = read_layer_index(data, offset, names)
+            state, offset = read_bytes(data, offset, 2)
+            args = (index, bool(state[0]), state[1] / 100)
+        elif op == EV_LAYER_IMAGE:
+            index, offset = read_layer_index(data, offset, names)
+            w, offset = read_varint(data, offset)
+            h, offset = read_varint(data, offset)
+            length, offset = read_varint(data, offset)
+            compressed, offset = read_bytes(data, offset, length)
+            try:
+                pixels = zlib.decompress(compressed)
+            except zlib.error as error:
+                raise ValueError(f"corrupt layer image in drawing session: {error}")
+            if len(pixels) != w * h * 4:
+                raise ValueError("corrupt layer image in drawing session")
+            args = (index, QImage(pixels, w, h, w * 4, QImage.Format_ARGB32_Premultiplied).copy())
+        elif op == EV_SHAPE:
+            kind, offset = read_bytes(data, offset, 1)
+            if kind[0] >= len(SHAPES):
+                raise ValueError(f"unknown shape {kind[0]} in drawing session")
+            kind = SHAPES[kind[0]]
+            values = []
+            for _ in range(4):
+                value, offset = read_signed(data, offset)
+                values.append(value / SCALE)
+            shape_width, offset = read_varint(data, offset)
+            args = (kind, QPointF(values[0], values[1]), QPointF(values[2], values[3]), shape_width / SCALE)
+        elif op == EV_FILL:
+            fill_x, offset = read_varint(data, offset)
+            fill_y, offset = read_varint(data, offset)
+            args = (fill_x, fill_y)
+        elif op in (EV_STROKE_END, EV_RESTORE, EV_CLEAR):
+            args = ()
+        else:
+            raise ValueError(f"unknown drawing session event {op}")
+        events.append((now, op, args))
+    return names, events
+
+
+class SessionPlayer(QObject):
+    updated = pyqtSignal(QRegion)
+    finished = pyqtSignal()
+
+    def __init__(self, data, canvas=None, parent=None):
+        super().__init__(parent)
+        self.names, self.events = decode(data)
+        self.duration = self.events[-1][0] if self.events else 0
+        # a player without a canvas owns one and follows the recorded size,
+        # replaying into a window's canvas keeps the window's size
+        self.owns_canvas = canvas is None
+        if canvas is None:
+            canvas = LayeredCanvas(layers=tuple((name, 1.0) for name in self.names), headless=True)
+        self.canvas = canvas
+        self.layers = [canvas.layer(name) for name in self.names]
+        self.position = 0
+        self.time = 0
+        self.speed = 1.0
+        self.engine = DrawingEngine(canvas)
+        self._layer = self.layers[-1] if self.layers else None
+        self._snapshot = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(16)
+        self._timer.timeout.connect(self._tick)
+        self._clock = QElapsedTimer()
+        self._handlers = {
+            EV_RESIZE: self._resize,
+            EV_TOOL: self._tool,
+            EV_LAYER: self._select_layer,
+            EV_LAYER_STATE: self._layer_state,
+            EV_LAYER_IMAGE: self._layer_image,
+            EV_STROKE_BEGIN: self._stroke_begin,
+            EV_STROKE_POINT: self._stroke_point,
+            EV_STROKE_END: self._stroke_end,
+            EV_RESTORE: self._restore,
+            EV_SHAPE: self._shape,
+            EV_FILL: self._fill,
+            EV_CLEAR: self._clear,
+        }
+
+    def is_finished(self):
+        return self.position >= len(self.events)
+
+    def advance(self, until_ms):
+        # applies every event up to until_ms and returns the region of the
+        # composite that changed
+        events = self.events
+        handlers = self._handlers
+        while self.position < len(events) and events[self.position][0] <= until_ms:
+            _, op, args = events[self.position]
+            handlers[op](*args)
+            self.position += 1
+        self.time = until_ms
+        return self.canvas.compose()
+
+    def play(self, speed=4.0):
+        # speed 0 renders the whole session at once
+        self.speed = speed
+        if speed <= 0:
+            self.updated.emit(self.advance(self.duration))
+            self.finished.emit()
+            return
+        self._clock.start()
+        self._start_time = self.time
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def _tick(self):
+        dirty = self.advance(self._start_time + self._clock.elapsed() * self.speed)
+        if not dirty.isEmpty():
+            self.updated.emit(dirty)
+        if self.is_finished():
+            self._timer.stop()
+            self.finished.emit()
+
+    def export_frames(self, directory, fps=30, speed=1.0, prefix="frame"):
+        # frames are encoded on the thread pool while the next ones render
+        os.makedirs(directory, exist_ok=True)
+        pool = QThreadPool.globalInstance()
+        step = 1000 * speed / fps
+        paths = []
+        image = None
+        while True:
+            dirty = self.advance(len(paths) * step)
+            if image is None or not dirty.isEmpty():
+                image = self.canvas.to_image()
+            path = os.path.join(directory, f"{prefix}_{len(paths):05d}.png")
+            pool.start(SaveImageTask(image, path))
+            paths.append(path)
+            if self.is_finished():
+                break
+        pool.waitForDone()
+        return paths
+
+    def _resize(self, size):
+        if self.owns_canvas:
+            self.canvas.resize(size)
+
+    def _tool(self, color, eraser):
+        self.engine.set_tool(color, eraser)
+
+    def _select_layer(self, index):
+        self._layer = self.layers[index] if index < len(self.layers) else None
+
+    def _layer_state(self, index, visible, opacity):
+        layer = self.layers[index] if index < len(self.layers) else None
+        if layer is not None:
+            self.canvas.set_visible(layer.name, visible)
+            self.canvas.set_opacity(layer.name, opacity)
+
+    def _layer_image(self, index, image):
+        layer = self.layers[index] if index < len(self.layers) else None
+        if layer is None:
+            return
+        painter = QPainter(layer.image)
+        painter.setCompositionMode(QPainter.CompositionMode_Source)
+        painter.drawImage(0, 0, image)
+        painter.end()
+        self.canvas.mark_dirty()
+
+    def _stroke_begin(self, point, width, snapshot):
+        self._snapshot = self._layer.image.copy() if snapshot and self._layer is not None else None
+        self.engine.begin_stroke(point, width)
+
+    def _stroke_point(self, point, width):
+        if self._layer is not None:
+            self.engine.stroke_to(point, width, self._layer)
+
+    def _stroke_end(self):
+        self.engine.end_stroke()
+
+    def _restore(self):
+        if self._snapshot is not None and self._layer is not None:
+            self._layer.image = self._snapshot
+            self._snapshot = None
+            self.canvas.mark_dirty()
+
+    def _shape(self, kind, start, end, width):
+        if self._layer is not None:
+            self.engine.shape(kind, start, end, width, self._layer)
+
+    def _fill(self, x, y):
+        if self._layer is not None:
+            self.engine.fill(x, y, self._layer)
+
+    def _clear(self):
+        self.engine.clear()
+
+
+def main(argv):
+    # python session_recorder.py session.aosr out_dir [fps] [speed]
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtGui import QGuiApplication
+    app = QGuiApplication(argv)
+    with open(argv[1], "rb") as session:
+        player = SessionPlayer(session.read())
+    fps = float(argv[3]) if len(argv) > 3 else 30
+    speed = float(argv[4]) if len(argv) > 4 else 1.0
+    start = time.perf_counter()
+    paths = player.export_frames(argv[2], fps, speed)
+    print(f"{len(paths)} frames in {time.perf_counter() - start:.2f} s")
+    del app
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,120 @@
+import math
+from PyQt5.QtCore import Qt, QPointF, QRect, QRectF, QLineF
+from PyQt5.QtGui import QPainter, QPolygonF
+from PyQt5.QtWidgets import QWidget
+
+SHAPES = ("line", "rectangle", "ellipse", "arrow")
+
+
+def arrow_head(start, end, width):
+    line = QLineF(QPointF(start), QPointF(end))
+    if line.length() == 0:
+        return QPolygonF()
+    size = max(12.0, width * 3)
+    angle = math.atan2(-line.dy(), line.dx())
+    left = QPointF(end) - QPointF(math.cos(angle - math.pi / 7) * size, -math.sin(angle - math.pi / 7) * size)
+    right = QPointF(end) - QPointF(math.cos(angle + math.pi / 7) * size, -math.sin(angle + math.pi / 7) * size)
+    return QPolygonF([QPointF(end), left, right])
+
+
+def draw_shape(painter, kind, start, end, pen):
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(pen)
+    painter.setBrush(Qt.NoBrush)
+    rect = QRectF(QPointF(start), QPointF(end)).normalized()
+    if kind == "line":
+        painter.drawLine(QPointF(start), QPointF(end))
+    elif kind == "rectangle":
+        painter.drawRect(rect)
+    elif kind == "ellipse":
+        painter.drawEllipse(rect)
+    elif kind == "arrow":
+        painter.drawLine(QPointF(start), QPointF(end))
+        painter.setBrush(pen.color())
+        painter.drawPolygon(arrow_head(start, end, pen.widthF()))
+
+
+def shape_bounds(kind, start, end, width):
+    rect = QRectF(QPointF(start), QPointF(end)).normalized()
+    if kind == "arrow":
+        rect = rect.united(arrow_head(start, end, width).boundingRect())
+    margin = width / 2 + 2
+    return rect.adjusted(-margin, -margin, margin, margin).toAlignedRect()
+
+
+def recognize_shape(points, tolerance=0.08):
+    if len(points) < 3:
+        return None
+    points = [QPointF(p) for p in points]
+    xs = [p.x() for p in points]
+    ys = [p.y() for p in points]
+    left, right, top, bottom = min(xs), max(xs), min(ys), max(ys)
+    diagonal = math.hypot(right - left, bottom - top)
+    if diagonal < 10:
+        return None
+
+    first, last = points[0], points[-1]
+    chord = QLineF(first, last)
+    if chord.length() > diagonal * 0.8:
+        # open stroke, snap to a line when no point strays from the chord
+        dx, dy = chord.dx(), chord.dy()
+        deviation = max(abs(dy * (p.x() - first.x()) - dx * (p.y() - first.y())) / chord.length() for p in points)
+        if deviation / chord.length() < tolerance:
+            return ("line", first, last)
+        return None
+
+    if chord.length() > diagonal * 0.25:
+        return None
+
+    # closed stroke, compare how well the bounding box and its inscribed
+    # ellipse explain the points
+    cx, cy = (left + right) / 2, (top + bottom) / 2
+    rx, ry = max((right - left) / 2, 1), max((bottom - top) / 2, 1)
+    rect_error = 0.0
+    ellipse_error = 0.0
+    for p in points:
+        rect_error += min(abs(p.x() - left), abs(p.x() - right), abs(p.y() - top), abs(p.y() - bottom))
+        nx, ny = (p.x() - cx) / rx, (p.y() - cy) / ry
+        ellipse_error += abs(math.hypot(nx, ny) - 1) * min(rx, ry)
+    rect_error /= len(points) * diagonal
+    ellipse_error /= len(points) * diagonal
+    corners = (QPointF(left, top), QPointF(right, bottom))
+    if rect_error < ellipse_error and rect_error < tolerance:
+        return ("rectangle",) + corners
+    if ellipse_error < tolerance:
+        return ("ellipse",) + corners
+    return None
+
+
+class ShapePreview(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
+        self.setAttribute(Qt.WA_NoSystemBackground, True)
+        self.kind = None
+        self.start = None
+        self.end = None
+        self.pen = None
+        self._bounds = QRect()
+
+    def set_shape(self, kind, start, end, pen):
+        self.kind = kind
+        self.start = start
+        self.end = end
+        self.pen = pen
+        bounds = shape_bounds(kind, start, end, pen.widthF())
+        # repaint only what the previous and the new preview cover
+        self.update(self._bounds.united(bounds))
+        self._bounds = bounds
+
+    def clear(self):
+        self.update(self._bounds)
+        self.kind = None
+        self._bounds = QRect()
+
+    def paintEvent(self, event):
+        if self.kind is None:
+            return
+        painter = QPainter(self)
+        draw_shape(painter, self.kind, self.start, self.end, self.pen)
+        painter.end()
@@ -0,0 +1,26 @@
+from PyQt5.QtWidgets import QPushButton
+
+from application_manager import ApplicationManager
+from apps_panel import AppsPanel
+
+
+def row_button(panel, hwnd, text):
+    row = panel.list_layout.itemAt(panel.listed_windows.index(hwnd)).layout()
+    for i in range(row.count()):
+        widget = row.itemAt(i).widget()
+        if isinstance(widget, QPushButton) and widget.text() == text:
+            return widget
+    return None
+
+
+def test_row_close_button_only_closes_its_window(qapp, monkeypatch):
+    calls = []
+    monkeypatch.setattr(ApplicationManager, "get_open_windows", staticmethod(lambda: [(1, "Editor"), (2, "Browser")]))
+    monkeypatch.setattr(ApplicationManager, "close_windows", staticmethod(lambda hwnds: calls.append(("close", hwnds))))
+    monkeypatch.setattr(ApplicationManager, "bring_to_current_monitor",
+                        staticmethod(lambda hwnd: calls.append(("bring", hwnd))))
+    panel = AppsPanel()
+    panel.populate()
+
+    row_button(panel, 2, "✕").click()
+    assert calls == [("close", [2])]
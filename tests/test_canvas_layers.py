@@ -0,0 +1,60 @@
+import os
+
+import pytest
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QColor
+
+from canvas_layers import LayeredCanvas
+from drawing_engine import DrawingEngine
+
+
+def drawn_canvas():
+    canvas = LayeredCanvas(QSize(120, 90), headless=True)
+    engine = DrawingEngine(canvas)
+    engine.set_tool(color=QColor(200, 40, 30, 180), width=7)
+    engine.stroke([(5, 5), (60, 40), (110, 80)], layer="ink")
+    engine.set_tool(color=QColor("#FFEB3B"))
+    engine.shape("ellipse", (20, 20), (90, 70), layer="highlighter")
+    engine.fill(2, 88, layer="background")
+    return canvas
+
+
+@pytest.mark.parametrize("to_disk", [True, False])
+def test_spill_and_restore_are_pixel_exact(to_disk):
+    canvas = drawn_canvas()
+    layers = [layer.image.copy() for layer in canvas.layers]
+    composite = canvas.to_image()
+
+    canvas.spill(to_disk)
+    assert canvas.is_spilled()
+    assert canvas.size() == QSize(120, 90)
+    canvas.restore()
+    assert not canvas.is_spilled()
+    assert [layer.image for layer in canvas.layers] == layers
+    assert canvas.to_image() == composite
+
+
+def test_missing_spill_file_restores_blank_layers():
+    canvas = drawn_canvas()
+    canvas.layers[0].resize(QSize(100, 80))
+    canvas.spill()
+    os.remove(canvas._spilled[2][0])
+    canvas.restore()
+
+    assert not canvas.is_spilled()
+    assert [layer.image.size() for layer in canvas.layers] == [QSize(100, 80), QSize(120, 90), QSize(120, 90)]
+    for layer in canvas.layers:
+        assert layer.image.pixelColor(50, 40).alpha() == 0
+    # the canvas can be drawn on again
+    assert DrawingEngine(canvas).draw_line((0, 0), (30, 30)) is not None
+
+
+def test_corrupt_spill_data_restores_blank_layers():
+    canvas = drawn_canvas()
+    canvas.spill(to_disk=False)
+    size, sizes, chunks = canvas._spilled
+    canvas._spilled = (size, sizes, [b"garbage"] + chunks[1:])
+    canvas.restore()
+
+    assert not canvas.is_spilled()
+    assert all(layer.image.pixelColor(60, 40).alpha() == 0 for layer in canvas.layers)
@@ -0,0 +1,127 @@
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QColor, QImage, QPainter
+
+from drawing_engine import DrawingEngine, flood_fill
+
+
+def blank(width=40, height=30):
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    image.fill(QColor(0, 0, 0, 0))
+    return image
+
+
+def count(image, color):
+    return sum(image.pixelColor(x, y) == color for x in range(image.width()) for y in range(image.height()))
+
+
+def test_fill_covers_a_blank_image(qapp):
+    image = blank()
+    assert flood_fill(image, 5, 5, QColor("#F44336"))
+    assert count(image, QColor("#F44336")) == 40 * 30
+
+
+def test_fill_stops_at_borders_and_does_not_leak_diagonally(qapp):
+    image = blank()
+    painter = QPainter(image)
+    painter.setPen(QColor("white"))
+    painter.drawRect(10, 10, 10, 10)
+    painter.end()
+    # a diagonal gap is closed for a 4-connected fill
+    image.setPixelColor(20, 20, QColor(0, 0, 0, 0))
+    image.setPixelColor(21, 21, QColor("white"))
+    assert flood_fill(image, 15, 15, QColor("#00BCD4"))
+    assert count(image, QColor("#00BCD4")) == 9 * 9
+    assert image.pixelColor(5, 5) == QColor(0, 0, 0, 0)
+
+
+def test_fill_reaches_around_concave_shapes(qapp):
+    image = blank(9, 7)
+    # a U shaped wall, the fill starts inside and has to go back up
+    for y in range(1, 6):
+        image.setPixelColor(2, y, QColor("white"))
+        image.setPixelColor(6, y, QColor("white"))
+    for x in range(2, 7):
+        image.setPixelColor(x, 5, QColor("white"))
+    assert flood_fill(image, 4, 1, QColor("red"))
+    assert count(image, QColor("white")) == 13
+    assert count(image, QColor("red")) == 9 * 7 - 13
+
+
+def test_fill_with_the_same_color_does_nothing(qapp):
+    image = blank()
+    image.fill(QColor("red"))
+    assert not flood_fill(image, 0, 0, QColor("red"))
+
+
+def test_engine_applies_a_batch_of_operations(qapp):
+    engine = DrawingEngine(size=QSize(200, 150))
+    applied = engine.apply([
+        {"op": "tool", "color": "#F44336", "width": 4},
+        {"op": "shape", "kind": "rectangle", "start": [20, 20], "end": [120, 100]},
+        {"op": "fill", "x": 60, "y": 60},
+        {"op": "stroke", "points": [[150, 10], [190, 140]]},
+    ])
+    assert applied == 4
+    image = engine.render()
+    assert image.pixelColor(60, 60) == QColor("#F44336")
+    assert image.pixelColor(170, 75).alpha() > 0
+    assert image.pixelColor(5, 140).alpha() == 0
+
+
+def test_eraser_clears_what_was_drawn(qapp):
+    engine = DrawingEngine(size=QSize(100, 100))
+    engine.stroke([(10, 50), (90, 50)], width=10)
+    assert engine.render().pixelColor(50, 50).alpha() > 0
+    engine.set_tool(eraser=True)
+    engine.stroke([(10, 50), (90, 50)], width=14)
+    assert engine.render().pixelColor(50, 50).alpha() == 0
+
+
+def test_stamps_and_pen_both_draw(qapp):
+    for use_stamps in (False, True):
+        engine = DrawingEngine(size=QSize(100, 100))
+        engine.use_stamps = use_stamps
+        engine.stroke([(10, 10), (90, 90)], widths=[2, 12])
+        assert engine.render().pixelColor(50, 50).alpha() > 0
+
+
+def test_image_is_drawn_on_in_place(qapp):
+    image = blank(50, 50)
+    engine = DrawingEngine.from_image(image)
+    engine.set_tool(color="#0000ff")
+    engine.fill(10, 10)
+    assert image.pixelColor(10, 10) == QColor("#0000ff")
+
+
+HEADLESS_SCRIPT = """
+from PyQt5.QtGui import QImage, QColor
+from drawing_engine import DrawingEngine
+image = QImage(60, 40, QImage.Format_ARGB32)
+image.fill(QColor("white"))
+engine = DrawingEngine.from_image(image)
+engine.use_stamps = True
+engine.apply([
+    {"op": "tool", "color": "#ff0000", "width": 4},
+    {"op": "shape", "kind": "rectangle", "start": [5, 5], "end": [50, 30]},
+    {"op": "stroke", "points": [[0, 39], [59, 0]]},
+    {"op": "fill", "x": 55, "y": 35},
+])
+engine.clear()
+DrawingEngine().stroke([(1, 1), (50, 50)])
+print(engine.render().size().width())
+"""
+
+
+def test_engine_runs_without_a_qguiapplication():
+    # the test session has an application, so this runs in a fresh process
+    import os
+    import subprocess
+    import sys
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env.pop("QT_QPA_PLATFORM", None)
+    env.pop("DISPLAY", None)
+    result = subprocess.run([sys.executable, "-c", HEADLESS_SCRIPT], cwd=root, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "60"
@@ -0,0 +1,90 @@
+import os
+
+import drawing_window
+from drawing_window import DrawingWindow
+from session_recorder import SessionRecorder
+
+
+def test_replay_is_disabled_while_recording(qapp, tmp_path, monkeypatch):
+    monkeypatch.setattr(drawing_window.QFileDialog, "getSaveFileName", lambda *args: ("", ""))
+    window = DrawingWindow()
+    path = os.path.join(tmp_path, "session.aosr")
+    with open(path, "wb") as session:
+        session.write(SessionRecorder(window.canvas).data())
+
+    window.record_button.setChecked(True)
+    window.toggle_recording()
+    assert not window.replay_button.isEnabled()
+    events = window.recorder.events
+    window.replay_session(path)
+    # nothing was cleared or replayed behind the recorder's back
+    assert window.player is None
+    assert window.recorder.events == events
+
+    window.record_button.setChecked(False)
+    window.toggle_recording()
+    assert window.replay_button.isEnabled()
+
+
+def test_recording_is_disabled_during_a_replay(qapp, tmp_path):
+    window = DrawingWindow()
+    path = os.path.join(tmp_path, "session.aosr")
+    with open(path, "wb") as session:
+        session.write(SessionRecorder(window.canvas).data())
+
+    window.replay_session(path, speed=1.0)
+    assert not window.record_button.isEnabled()
+    window.stop_replay()
+    assert window.record_button.isEnabled()
+
+    window.replay_session(path, speed=0)
+    assert window.record_button.isEnabled()
+    window.close()
+
+
+def test_unreadable_sessions_are_reported(qapp, tmp_path, monkeypatch):
+    messages = []
+    monkeypatch.setattr(drawing_window.QMessageBox, "warning", lambda parent, title, text: messages.append(text))
+    window = DrawingWindow()
+    window.engine.stroke([(10, 10), (60, 60)])
+    drawn = window.canvas.to_image()
+    good = SessionRecorder(window.canvas).data()
+    for name, data in (("garbage.aosr", b"not a session"), ("truncated.aosr", good[:-3])):
+        path = os.path.join(tmp_path, name)
+        with open(path, "wb") as session:
+            session.write(data)
+        window.replay_session(path)
+    window.replay_session(os.path.join(tmp_path, "missing.aosr"))
+
+    assert len(messages) == 3
+    assert window.player is None
+    assert window.record_button.isEnabled()
+    assert window.canvas.to_image() == drawn
+
+
+def test_failed_save_asks_again(qapp, tmp_path, monkeypatch):
+    messages = []
+    monkeypatch.setattr(drawing_window.QMessageBox, "warning", lambda parent, title, text: messages.append(text))
+    path = os.path.join(tmp_path, "session.aosr")
+    answers = [(str(tmp_path), ""), (path, "")]
+    monkeypatch.setattr(drawing_window.QFileDialog, "getSaveFileName", lambda *args: answers.pop(0))
+    window = DrawingWindow()
+    window.record_button.setChecked(True)
+    window.toggle_recording()
+    window.record_button.setChecked(False)
+    window.toggle_recording()
+
+    assert len(messages) == 1
+    with open(path, "rb") as session:
+        assert session.read()[:4] == b"AOSR"
+
+
+def test_color_sample_size_reaches_the_loupe(qapp):
+    from color_sampler import ColorLoupe
+    window = DrawingWindow(color_sample_size=5)
+    assert window.color_sample_size == 5
+    assert "5x5" in window.color_picker_button.toolTip()
+    window.color_loupe = ColorLoupe(window.screen_sampler, window.color_sample_size)
+    window.set_color_sample_size(9)
+    assert window.color_loupe.sample_size == 9
+    window.color_loupe = None
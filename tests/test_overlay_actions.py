@@ -0,0 +1,89 @@
+import json
+
+import pytest
+from PyQt5.QtWidgets import QPushButton
+
+from overlay_actions import ActionEntry, OverlayAction, load_action_entries
+
+
+class CountingAction(OverlayAction):
+    triggered = 0
+
+    def trigger(self):
+        CountingAction.triggered += 1
+
+
+class BrokenTrigger(OverlayAction):
+    def trigger(self):
+        raise RuntimeError("boom")
+
+
+def click(entry):
+    button = QPushButton(entry.label)
+    button.clicked.connect(lambda _: entry.activate(None, button))
+    button.click()
+    return button
+
+
+def test_action_is_loaded_on_first_click_and_reused(qapp):
+    entry = ActionEntry("count", "count", "test_overlay_actions:CountingAction")
+    CountingAction.triggered = 0
+    click(entry)
+    action = entry.action
+    click(entry)
+    assert entry.action is action
+    assert CountingAction.triggered == 2
+
+
+@pytest.mark.parametrize("target", ["nonexistent_module:Action", "test_overlay_actions:Missing"])
+def test_unloadable_action_disables_its_button(qapp, capsys, target):
+    entry = ActionEntry("bad", "bad", target)
+    button = click(entry)
+    assert entry.action is None
+    assert not button.isEnabled()
+    assert "could not load action 'bad'" in button.toolTip()
+    assert "could not load action 'bad'" in capsys.readouterr().err
+
+
+def test_failing_constructor_disables_its_button(qapp):
+    entry = ActionEntry("bad", "bad", "test_overlay_actions:CountingAction", args={"unknown": 1})
+    assert not click(entry).isEnabled()
+
+
+def test_failing_trigger_is_reported(qapp, capsys):
+    entry = ActionEntry("broken", "broken", "test_overlay_actions:BrokenTrigger")
+    button = click(entry)
+    assert button.isEnabled()
+    assert "action 'broken' failed: boom" in capsys.readouterr().err
+
+
+def write_config(tmp_path, definitions):
+    path = tmp_path / "actions.json"
+    path.write_text(json.dumps(definitions), encoding="utf-8")
+    return str(path)
+
+
+def test_config_entries_keep_quit_last(tmp_path):
+    path = write_config(tmp_path, [
+        {"name": "save", "target": "actions.shortcut:ShortcutAction", "args": {"key": "S"}},
+        {"name": "quit", "target": "actions.quit:QuitAction"},
+    ])
+    entries = load_action_entries(path)
+    assert [e.name for e in entries][0] == "save"
+    assert entries[-1].name == "quit"
+    assert entries[0].args == {"key": "S"}
+
+
+@pytest.mark.parametrize("definition", [
+    {"name": "a"},
+    {"name": "a", "target": "actions.shortcut"},
+    {"name": "a", "target": "actions.shortcut:"},
+    {"name": "a", "target": "bad module:Action"},
+    {"name": "a", "target": 5},
+    {"target": "actions.quit:QuitAction"},
+    {"name": "a", "target": "actions.quit:QuitAction", "args": [1]},
+    "quit",
+])
+def test_malformed_entries_fail_at_startup(tmp_path, definition):
+    with pytest.raises(ValueError, match="actions.json: action 0"):
+        load_action_entries(write_config(tmp_path, [definition]))
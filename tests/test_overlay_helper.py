@@ -0,0 +1,107 @@
+import socket
+import sys
+import threading
+import time
+
+import pytest
+from PyQt5.QtCore import QRect
+
+import overlay_helper
+from overlay_helper import (HEADER, OP_NOOP, OP_PING, OP_PLACE_WINDOWS, PING, HelperClient, frame,
+                            read_exact)
+
+# a helper that connects and then never reads, like one stuck in a call
+HUNG_HELPER = [sys.executable, "-c",
+               "import socket, sys, time\n"
+               "sock = socket.create_connection(('127.0.0.1', int(sys.argv[-1])))\n"
+               "time.sleep(60)\n"]
+
+
+@pytest.fixture
+def served():
+    # serve() in a thread, connected back to a socket the test talks on
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1)
+    listener.settimeout(5)
+    thread = threading.Thread(target=overlay_helper.serve, args=(listener.getsockname()[1],), daemon=True)
+    thread.start()
+    sock, _ = listener.accept()
+    listener.close()
+    sock.settimeout(5)
+    yield sock
+    sock.close()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def ping(sock, seq):
+    sock.sendall(frame(OP_PING, PING.pack(seq)))
+    op, length = HEADER.unpack(read_exact(sock, HEADER.size))
+    return op, read_exact(sock, length)
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+def test_ping_frames_are_echoed(served):
+    assert ping(served, 7) == (OP_PING, PING.pack(7))
+    # frames split across writes are reassembled
+    data = frame(OP_NOOP) + frame(OP_PING, PING.pack(8))
+    served.sendall(data[:4])
+    time.sleep(0.05)
+    served.sendall(data[4:])
+    assert HEADER.unpack(read_exact(served, HEADER.size)) == (OP_PING, PING.size)
+    assert read_exact(served, PING.size) == PING.pack(8)
+
+
+def test_place_windows_payload_is_decoded(served, monkeypatch):
+    placed = []
+    monkeypatch.setattr(overlay_helper, "defer_window_positions",
+                        lambda placements, flags: placed.append((placements, flags)))
+    client = HelperClient()
+    sent = []
+    client.send = lambda op, payload=b"": sent.append(frame(op, payload))
+    client.place_windows([(0x1234, QRect(10, 20, 300, 200)), (-5, QRect(-1920, 0, 1920, 1080))], 0x44)
+
+    served.sendall(sent[0])
+    ping(served, 1)
+    assert placed == [([(0x1234, 10, 20, 300, 200), (-5, -1920, 0, 1920, 1080)], 0x44)]
+
+
+def test_failing_command_does_not_stop_the_helper(served, monkeypatch):
+    def fail(placements, flags):
+        raise OSError("no such window")
+    monkeypatch.setattr(overlay_helper, "defer_window_positions", fail)
+    served.sendall(frame(OP_PLACE_WINDOWS, b"\0\0\0\0"))
+    assert ping(served, 2) == (OP_PING, PING.pack(2))
+
+
+def test_killed_helper_is_respawned():
+    client = HelperClient()
+    try:
+        assert client.ping(timeout=10) is not None
+        assert not client.in_process
+        first = client.pid()
+        client._process.kill()
+        assert wait_for(lambda: client.pid() not in (None, first))
+        assert wait_for(lambda: client.ping(timeout=1) is not None)
+        assert client.restarts >= 1
+    finally:
+        client.stop()
+
+
+def test_watchdog_replaces_a_hung_helper():
+    client = HelperClient(command=HUNG_HELPER, hang_timeout=0.2)
+    try:
+        client.send(OP_NOOP)
+        assert wait_for(lambda: client.hangs >= 1)
+        assert wait_for(lambda: client.restarts >= 1)
+    finally:
+        client.stop()
@@ -0,0 +1,10 @@
+import os
+
+from region_capture import screenshot_path
+
+
+def test_screenshot_names_never_collide(tmp_path):
+    paths = [screenshot_path(str(tmp_path)) for _ in range(50)]
+    assert len(set(paths)) == 50
+    assert all(os.path.exists(path) for path in paths)
+    assert all(os.path.basename(path).startswith("screenshot_") for path in paths)
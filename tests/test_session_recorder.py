@@ -0,0 +1,112 @@
+import pytest
+from PyQt5.QtCore import QPointF, QSize
+from PyQt5.QtGui import QColor
+
+from canvas_layers import LayeredCanvas
+from drawing_engine import DrawingEngine
+from session_recorder import (EV_CLEAR, EV_FILL, EV_RESIZE, EV_SHAPE, EV_STROKE_BEGIN, EV_STROKE_END,
+                              EV_STROKE_POINT, EV_TOOL, SessionPlayer, SessionRecorder, decode,
+                              read_signed, read_varint, write_signed, write_varint)
+
+
+def test_varints_round_trip():
+    buffer = bytearray()
+    values = [0, 1, 127, 128, 300, 2 ** 35]
+    signed = [0, -1, 1, -64, 64, -(2 ** 30)]
+    for value in values:
+        write_varint(buffer, value)
+    for value in signed:
+        write_signed(buffer, value)
+    offset = 0
+    for value in values:
+        decoded, offset = read_varint(buffer, offset)
+        assert decoded == value
+    for value in signed:
+        decoded, offset = read_signed(buffer, offset)
+        assert decoded == value
+    assert offset == len(buffer)
+
+
+def record_session(canvas):
+    recorder = SessionRecorder(canvas)
+    engine = DrawingEngine(canvas)
+    red = QColor("#F44336")
+    engine.set_tool(color=red)
+    point, width = recorder.stroke_begin(QPointF(10.06, 20.0), 4.0, red, False, canvas.active_index)
+    engine.begin_stroke(point, width)
+    for x, y, w in ((30.3, 25.1, 5.0), (50.0, 40.94, 6.0), (44.0, 70.0, 3.2)):
+        point, width = recorder.stroke_point(QPointF(x, y), w)
+        engine.stroke_to(point, width)
+    engine.end_stroke()
+    recorder.stroke_end()
+    start, end = recorder.shape("rectangle", QPointF(100, 100), QPointF(150, 140), 3, red, False,
+                                canvas.active_index)
+    engine.shape("rectangle", start, end, 3)
+    recorder.fill(120, 120, red, False, canvas.active_index)
+    engine.fill(120, 120)
+    return recorder
+
+
+def test_decode_returns_the_recorded_events(qapp):
+    canvas = LayeredCanvas(QSize(200, 160))
+    recorder = record_session(canvas)
+    names, events = decode(recorder.data())
+    assert names == [layer.name for layer in canvas.layers]
+    ops = [op for _, op, _ in events]
+    assert ops[0] == EV_RESIZE
+    assert ops[-7:] == [EV_STROKE_BEGIN, EV_STROKE_POINT, EV_STROKE_POINT, EV_STROKE_POINT, EV_STROKE_END,
+                        EV_SHAPE, EV_FILL]
+    assert EV_TOOL in ops
+    assert len(events) == recorder.events
+    assert [t for t, _, _ in events] == sorted(t for t, _, _ in events)
+
+    strokes = [args for _, op, args in events if op in (EV_STROKE_BEGIN, EV_STROKE_POINT)]
+    # coordinates and widths are kept in 1/8 px
+    assert strokes[0][0] == QPointF(10.0, 20.0) and strokes[0][1] == 4.0
+    assert strokes[1][0] == QPointF(30.25, 25.125)
+    assert strokes[3][0] == QPointF(44.0, 70.0) and strokes[3][1] == 3.25
+    fill = [args for _, op, args in events if op == EV_FILL]
+    assert fill == [(120, 120)]
+
+
+def test_truncated_sessions_raise_value_error(qapp):
+    data = record_session(LayeredCanvas(QSize(200, 160))).data()
+    with pytest.raises(ValueError):
+        decode(b"AOSR")
+    with pytest.raises(ValueError):
+        decode(data[:-1])
+    # every cut either ends between events or is reported as truncated
+    for end in range(len(data)):
+        try:
+            decode(data[:end])
+        except ValueError:
+            pass
+
+
+def test_replay_is_pixel_identical(qapp):
+    canvas = LayeredCanvas(QSize(200, 160))
+    recorder = record_session(canvas)
+    player = SessionPlayer(recorder.data())
+    player.advance(player.duration)
+    assert player.is_finished()
+    assert player.canvas.to_image() == canvas.to_image()
+
+
+def test_existing_drawing_is_part_of_the_session(qapp):
+    canvas = LayeredCanvas(QSize(100, 80))
+    DrawingEngine(canvas).stroke([(10, 10), (90, 70)], width=6)
+    recorder = SessionRecorder(canvas)
+    player = SessionPlayer(recorder.data())
+    player.advance(player.duration)
+    assert player.canvas.to_image() == canvas.to_image()
+
+    recorder.clear()
+    _, events = decode(recorder.data())
+    assert events[-1][1] == EV_CLEAR
+
+
+def test_decode_rejects_other_data():
+    with pytest.raises(ValueError):
+        decode(b"PNG\x00\x01")
+    with pytest.raises(ValueError):
+        decode(b"AOSR\x63")
@@ -0,0 +1,62 @@
+import math
+
+from PyQt5.QtCore import QPointF
+
+from shapes import recognize_shape, shape_bounds
+
+
+def points_along(path, count=60):
+    return [QPointF(*path(i / (count - 1))) for i in range(count)]
+
+
+def test_straight_stroke_snaps_to_a_line():
+    points = points_along(lambda t: (10 + 200 * t, 20 + 100 * t + math.sin(t * 20)))
+    kind, start, end = recognize_shape(points)
+    assert kind == "line"
+    assert start == points[0] and end == points[-1]
+
+
+def test_wobbly_open_stroke_is_not_a_line():
+    points = points_along(lambda t: (10 + 200 * t, 20 + 40 * math.sin(t * 6)))
+    assert recognize_shape(points) is None
+
+
+def rectangle_path(t):
+    # perimeter of a 200x100 rectangle walked clockwise from the top left
+    distance = t * 600
+    if distance < 200:
+        return 50 + distance, 50
+    if distance < 300:
+        return 250, 50 + distance - 200
+    if distance < 500:
+        return 250 - (distance - 300), 150
+    return 50, 150 - (distance - 500)
+
+
+def test_closed_box_is_a_rectangle():
+    kind, top_left, bottom_right = recognize_shape(points_along(rectangle_path, 120))
+    assert kind == "rectangle"
+    assert top_left == QPointF(50, 50) and bottom_right == QPointF(250, 150)
+
+
+def test_closed_loop_is_an_ellipse():
+    points = points_along(lambda t: (150 + 100 * math.cos(t * 2 * math.pi), 100 + 50 * math.sin(t * 2 * math.pi)))
+    kind, top_left, bottom_right = recognize_shape(points)
+    assert kind == "ellipse"
+    assert abs(top_left.x() - 50) < 1 and abs(bottom_right.y() - 150) < 1
+
+
+def test_scribbles_and_tiny_strokes_are_left_alone():
+    assert recognize_shape([QPointF(0, 0), QPointF(1, 1)]) is None
+    assert recognize_shape(points_along(lambda t: (t * 5, t * 3))) is None
+    # a closed zig-zag is neither a box nor an ellipse
+    zigzag = points_along(lambda t: (100 + 80 * math.cos(t * 2 * math.pi) * (1 + 0.5 * math.sin(t * 40)),
+                                     100 + 80 * math.sin(t * 2 * math.pi) * (1 + 0.5 * math.sin(t * 40))), 200)
+    assert recognize_shape(zigzag) is None
+
+
+def test_shape_bounds_include_the_pen_and_arrow_head():
+    line = shape_bounds("line", QPointF(10, 10), QPointF(110, 10), 4)
+    arrow = shape_bounds("arrow", QPointF(10, 10), QPointF(110, 10), 4)
+    assert line.contains(10, 10) and line.contains(110, 12)
+    assert arrow.height() > line.height()
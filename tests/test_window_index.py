@@ -0,0 +1,74 @@
+from window_index import WindowIndex, subsequence_span, trigrams
+
+WINDOWS = [
+    (1, "Inbox - Mail"),
+    (2, "report.docx - Word"),
+    (3, "Google Chrome"),
+    (4, "chrome://settings - Chrome"),
+    (5, "Terminal"),
+]
+
+
+def make_index(windows=WINDOWS):
+    index = WindowIndex()
+    index.update(windows)
+    return index
+
+
+def test_trigrams_are_padded_and_lowercase():
+    assert trigrams("Ab") == {"  a", " ab", "ab "}
+
+
+def test_subsequence_span():
+    assert subsequence_span("rpt", "report") == 6
+    assert subsequence_span("rp", "report") == 3
+    assert subsequence_span("xyz", "report") is None
+
+
+def test_update_only_counts_changed_windows():
+    index = make_index()
+    assert index.update(WINDOWS) == 0
+    changed = WINDOWS[:4] + [(5, "Terminal - ssh"), (6, "Notes")]
+    assert index.update(changed) == 2
+    assert index.update(changed[1:]) == 1
+    assert 1 not in index.titles
+    assert index.search("inbox") == []
+    assert index.search("ssh")[0] == 5
+
+
+def test_empty_query_lists_in_z_order():
+    assert make_index().search("") == [1, 2, 3, 4, 5]
+
+
+def test_touched_windows_come_first():
+    index = make_index()
+    index.touch(5)
+    index.touch(3)
+    assert index.search("")[:2] == [3, 5]
+    assert index.search("chrome") == [3, 4]
+
+
+def test_word_start_matches_rank_before_inner_matches():
+    index = make_index([(1, "xchrome"), (2, "chrome")])
+    assert index.search("chrome") == [2, 1]
+
+
+def test_short_queries_match_substrings():
+    index = make_index()
+    assert index.search("ch") == [3, 4]
+    assert index.search("W") == [2]
+
+
+def test_subsequence_matches_rank_after_substrings():
+    index = make_index()
+    # "rpt" is only a subsequence of "report"
+    assert index.search("rpt") == [2]
+    assert index.search("term") == [5]
+    assert index.search("zzz") == []
+
+
+def test_limit_returns_the_head_of_the_full_ranking():
+    windows = [(i, f"chrome tab {i}" if i % 2 else f"c-h-r-o-m-e {i}") for i in range(40)]
+    index = make_index(windows)
+    for query in ("", "chrome", "chr", "c", "crm"):
+        assert index.search(query, limit=16) == index.search(query)[:16]
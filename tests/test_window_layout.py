@@ -0,0 +1,49 @@
+from PyQt5.QtCore import QRect
+
+from application_manager import ApplicationManager
+
+AREA = QRect(100, 50, 1200, 800)
+
+
+def test_tile_rects_fill_a_grid():
+    rects = ApplicationManager.tile_rects(4, AREA)
+    assert rects == [
+        QRect(100, 50, 600, 400), QRect(700, 50, 600, 400),
+        QRect(100, 450, 600, 400), QRect(700, 450, 600, 400),
+    ]
+
+
+def test_tile_rects_last_row_is_stretched():
+    rects = ApplicationManager.tile_rects(5, AREA)
+    assert len(rects) == 5
+    # 3 columns, 2 rows: the two windows in the last row share the width
+    assert [r.width() for r in rects] == [400, 400, 400, 600, 600]
+    assert rects[3].x() == 100 and rects[4].x() == 700
+    assert all(AREA.contains(r) for r in rects)
+
+
+def test_tile_rects_do_not_overlap():
+    for count in range(1, 12):
+        rects = ApplicationManager.tile_rects(count, AREA)
+        assert len(rects) == count
+        for i, a in enumerate(rects):
+            assert AREA.contains(a)
+            assert not any(a.intersects(b) for b in rects[i + 1:])
+
+
+def test_single_window_takes_the_whole_area():
+    assert ApplicationManager.tile_rects(1, AREA) == [AREA]
+
+
+def test_cascade_rects_step_diagonally_and_wrap():
+    rects = ApplicationManager.cascade_rects(20, AREA, step=32)
+    assert rects[0] == QRect(100, 50, 800, 533)
+    assert rects[1].x() - rects[0].x() == 32 and rects[1].y() - rects[0].y() == 32
+    # the offsets wrap before a window would leave the area
+    assert all(AREA.contains(r) for r in rects)
+    assert rects[8] == rects[0]
+
+
+def test_cascade_rects_in_a_small_area_stay_put():
+    rects = ApplicationManager.cascade_rects(3, QRect(0, 0, 60, 60))
+    assert rects == [QRect(0, 0, 40, 40)] * 3
@@ -0,0 +1,142 @@
+import threading
+import time
+
+from PyQt5 import sip
+from PyQt5.QtCore import QSize
+from PyQt5.QtGui import QImage
+
+from window_thumbnails import FakeCaptureBackend, ThumbnailCache, ThumbnailLoader, capture_pool
+
+
+def load(qapp, loader, hwnd):
+    image = loader.request(hwnd)
+    if image is None:
+        loader.pool.waitForDone()
+        qapp.processEvents()
+    return image
+
+
+def make_loader(qapp, cache=None):
+    backend = FakeCaptureBackend()
+    backend.set_window(1, "stamp-a", "#ff0000")
+    backend.set_window(2, "stamp-b", "#00ff00")
+    return backend, ThumbnailLoader(backend=backend, cache=cache)
+
+
+def test_thumbnails_are_captured_in_the_background_and_scaled(qapp):
+    backend, loader = make_loader(qapp)
+    ready = []
+    loader.thumbnail_ready.connect(lambda hwnd, image: ready.append((hwnd, image)))
+    assert load(qapp, loader, 1) is None
+    assert [hwnd for hwnd, _ in ready] == [1]
+    image = ready[0][1]
+    assert image.width() <= 64 and image.height() <= 40
+    assert image.pixelColor(0, 0).name() == "#ff0000"
+
+
+def test_reopened_list_reuses_the_cache(qapp):
+    backend, loader = make_loader(qapp)
+    load(qapp, loader, 1)
+    load(qapp, loader, 2)
+    assert backend.captures == 2
+    # rendering the list again with unchanged windows captures nothing
+    assert loader.request(1) is not None
+    assert loader.request(2) is not None
+    loader.pool.waitForDone()
+    assert backend.captures == 2
+
+
+def test_pending_capture_is_not_started_twice(qapp):
+    backend, loader = make_loader(qapp)
+    loader.request(1)
+    loader.request(1)
+    loader.pool.waitForDone()
+    qapp.processEvents()
+    assert backend.captures == 1
+
+
+def test_changed_stamp_invalidates_the_old_entry(qapp):
+    backend, loader = make_loader(qapp)
+    load(qapp, loader, 1)
+    backend.set_window(1, "stamp-a2", "#0000ff")
+    assert load(qapp, loader, 1) is None
+    assert backend.captures == 2
+    assert loader.cache.get((1, "stamp-a")) is None
+    image = loader.request(1)
+    assert image is not None and image.pixelColor(0, 0).name() == "#0000ff"
+    assert len(loader.cache) == 1
+
+
+def test_failed_capture_is_not_cached(qapp):
+    backend, loader = make_loader(qapp)
+    backend.set_window(3, "stamp-c", size=QSize(0, 0))
+    assert load(qapp, loader, 3) is None
+    assert len(loader.cache) == 0
+    # a window that is gone has no stamp and is skipped
+    backend.remove_window(3)
+    assert loader.request(3) is None
+
+
+class StuckBackend(FakeCaptureBackend):
+    # capture blocks like PrintWindow on a window that stopped responding
+    def __init__(self):
+        super().__init__()
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def capture(self, hwnd):
+        self.started.set()
+        self.release.wait(5)
+        return super().capture(hwnd)
+
+
+def test_deleting_a_loader_does_not_wait_for_stuck_captures(qapp):
+    backend = StuckBackend()
+    backend.set_window(1, "stamp-a", "#ff0000")
+    loader = ThumbnailLoader(backend=backend)
+    ready = []
+    loader.thumbnail_ready.connect(lambda hwnd, image: ready.append(hwnd))
+    loader.request(1)
+    assert backend.started.wait(5)
+
+    start = time.perf_counter()
+    sip.delete(loader)
+    assert time.perf_counter() - start < 0.5
+
+    # the capture finishes later and is dropped without touching the loader
+    backend.release.set()
+    capture_pool().waitForDone()
+    qapp.processEvents()
+    assert ready == []
+
+
+def image_of(size):
+    image = QImage(size, size, QImage.Format_RGB32)
+    image.fill(0)
+    return image
+
+
+def test_byte_limit_evicts_least_recently_used(qapp):
+    one = image_of(10).sizeInBytes()
+    cache = ThumbnailCache(max_bytes=one * 2)
+    cache.put((1, "a"), image_of(10))
+    cache.put((2, "a"), image_of(10))
+    cache.get((1, "a"))
+    cache.put((3, "a"), image_of(10))
+    assert cache.used_bytes == one * 2
+    assert cache.get((2, "a")) is None
+    assert cache.get((1, "a")) is not None
+    assert cache.get((3, "a")) is not None
+
+
+def test_image_larger_than_the_limit_is_not_cached(qapp):
+    cache = ThumbnailCache(max_bytes=100)
+    cache.put((1, "a"), image_of(10))
+    assert len(cache) == 0
+    assert cache.used_bytes == 0
+
+
+def test_loader_without_pywin32_uses_the_fake_backend(qapp):
+    import window_thumbnails
+    if window_thumbnails.win32gui is None:
+        assert isinstance(ThumbnailLoader().backend, FakeCaptureBackend)
@@ -0,0 +1,115 @@
+import itertools
+
+
+def trigrams(text):
+    text = f"  {text.lower()} "
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def subsequence_span(query, text):
+    # length of the greedy left-most walk that contains query as a
+    # subsequence, or None when it does not match at all
+    position = -1
+    start = None
+    for char in query:
+        position = text.find(char, position + 1)
+        if position < 0:
+            return None
+        if start is None:
+            start = position
+    return position - start + 1
+
+
+class WindowIndex:
+    def __init__(self):
+        self.titles = {}
+        self._lowered = {}
+        self._postings = {}
+        self._activated = {}
+        self._z_order = {}
+        self._clock = itertools.count(1)
+
+    def update(self, windows):
+        # only windows that appeared, disappeared or changed title touch the
+        # trigram postings
+        changed = 0
+        seen = set()
+        for rank, (hwnd, title) in enumerate(windows):
+            seen.add(hwnd)
+            self._z_order[hwnd] = rank
+            if self.titles.get(hwnd) != title:
+                self._remove(hwnd)
+                self._add(hwnd, title)
+                changed += 1
+        for hwnd in [h for h in self.titles if h not in seen]:
+            self._remove(hwnd)
+            self._z_order.pop(hwnd, None)
+            self._activated.pop(hwnd, None)
+            changed += 1
+        return changed
+
+    def touch(self, hwnd):
+        self._activated[hwnd] = next(self._clock)
+
+    def _add(self, hwnd, title):
+        self.titles[hwnd] = title
+        self._lowered[hwnd] = title.lower()
+        for gram in trigrams(title):
+            self._postings.setdefault(gram, set()).add(hwnd)
+
+    def _remove(self, hwnd):
+        title = self.titles.pop(hwnd, None)
+        if title is None:
+            return
+        self._lowered.pop(hwnd, None)
+        for gram in trigrams(title):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(hwnd)
+                if not postings:
+                    del self._postings[gram]
+
+    def _recency(self, hwnd):
+        return (-self._activated.get(hwnd, 0), self._z_order.get(hwnd, 0))
+
+    def search(self, query, limit=None):
+        query = query.strip().lower()
+        if not query:
+            ranked = sorted(self.titles, key=self._recency)
+            return ranked[:limit] if limit else ranked
+
+        scored = {}
+        # the query is not padded, its grams must match anywhere in a title
+        grams = {query[i:i + 3] for i in range(len(query) - 2)}
+        if grams:
+            candidates = None
+            for gram in sorted(grams, key=lambda g: len(self._postings.get(g, ()))):
+                postings = self._postings.get(gram)
+                if not postings:
+                    candidates = set()
+                    break
+                candidates = set(postings) if candidates is None else candidates & postings
+                if not candidates:
+                    break
+            for hwnd in candidates or ():
+                position = self._lowered[hwnd].find(query)
+                if position >= 0:
+                    word_start = position == 0 or not self._lowered[hwnd][position - 1].isalnum()
+                    scored[hwnd] = 0 if word_start else 1
+        else:
+            for hwnd, lowered in self._lowered.items():
+                position = lowered.find(query)
+                if position >= 0:
+                    word_start = position == 0 or not lowered[position - 1].isalnum()
+                    scored[hwnd] = 0 if word_start else 1
+
+        if limit is None or len(scored) < limit:
+            for hwnd, lowered in self._lowered.items():
+                if hwnd in scored:
+                    continue
+                span = subsequence_span(query, lowered)
+                if span is not None:
+                    scored[hwnd] = 2 + span / len(lowered)
+
+        ranked = sorted(scored, key=lambda h: (scored[h],) + self._recency(h))
+        return ranked[:limit] if limit else ranked
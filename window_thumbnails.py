@@ -0,0 +1,195 @@
+import ctypes
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QSize, pyqtSignal
+from PyQt5.QtGui import QImage, QColor
+
+try:
+    import win32gui
+    import win32ui
+except ImportError:
+    win32gui = None
+    win32ui = None
+
+PW_RENDERFULLCONTENT = 2
+
+
+class ThumbnailCache:
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self._images = OrderedDict()
+
+    def get(self, key):
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+        return image
+
+    def put(self, key, image):
+        hwnd = key[0]
+        # an older stamp of the same window can never be hit again
+        for old_key in [k for k in self._images if k[0] == hwnd and k != key]:
+            self._remove(old_key)
+        if key in self._images:
+            self._remove(key)
+        size = image.sizeInBytes()
+        if size > self.max_bytes:
+            return
+        self._images[key] = image
+        self.used_bytes += size
+        while self.used_bytes > self.max_bytes:
+            self._remove(next(iter(self._images)))
+
+    def clear(self):
+        self._images.clear()
+        self.used_bytes = 0
+
+    def _remove(self, key):
+        image = self._images.pop(key)
+        self.used_bytes -= image.sizeInBytes()
+
+    def __len__(self):
+        return len(self._images)
+
+
+class Win32CaptureBackend:
+    def change_stamp(self, hwnd):
+        return (win32gui.GetWindowText(hwnd), win32gui.GetWindowRect(hwnd), win32gui.IsIconic(hwnd))
+
+    def capture(self, hwnd):
+        # PrintWindow waits for the window to paint, a window that stopped
+        # pumping messages would block the capture thread for good
+        if win32gui.IsIconic(hwnd) or ctypes.windll.user32.IsHungAppWindow(hwnd):
+            return None
+        left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+        width, height = right - left, bottom - top
+        if width <= 0 or height <= 0:
+            return None
+        hwnd_dc = win32gui.GetWindowDC(hwnd)
+        mfc_dc = win32ui.CreateDCFromHandle(hwnd_dc)
+        save_dc = mfc_dc.CreateCompatibleDC()
+        bitmap = win32ui.CreateBitmap()
+        try:
+            bitmap.CreateCompatibleBitmap(mfc_dc, width, height)
+            save_dc.SelectObject(bitmap)
+            if not ctypes.windll.user32.PrintWindow(hwnd, save_dc.GetSafeHdc(), PW_RENDERFULLCONTENT):
+                return None
+            bits = bitmap.GetBitmapBits(True)
+            return QImage(bits, width, height, QImage.Format_RGB32).copy()
+        finally:
+            win32gui.DeleteObject(bitmap.GetHandle())
+            save_dc.DeleteDC()
+            mfc_dc.DeleteDC()
+            win32gui.ReleaseDC(hwnd, hwnd_dc)
+
+
+class FakeCaptureBackend:
+    # used where pywin32 is missing and by the tests; windows are plain
+    # colored images registered with a change stamp, captures are counted
+    def __init__(self):
+        self.windows = {}
+        self.captures = 0
+
+    def set_window(self, hwnd, stamp, color="#808080", size=QSize(320, 200)):
+        self.windows[hwnd] = (stamp, QColor(color), QSize(size))
+
+    def remove_window(self, hwnd):
+        self.windows.pop(hwnd, None)
+
+    def change_stamp(self, hwnd):
+        return self.windows[hwnd][0]
+
+    def capture(self, hwnd):
+        window = self.windows.get(hwnd)
+        if window is None:
+            return None
+        self.captures += 1
+        image = QImage(window[2], QImage.Format_RGB32)
+        image.fill(window[1])
+        return image
+
+
+def default_backend():
+    if win32gui is None or win32ui is None:
+        return FakeCaptureBackend()
+    return Win32CaptureBackend()
+
+
+_capture_pool = None
+
+
+def capture_pool():
+    # shared by every loader and never deleted: a loader going away must not
+    # wait on the gui thread for a capture that is stuck in PrintWindow
+    global _capture_pool
+    if _capture_pool is None:
+        _capture_pool = QThreadPool()
+        _capture_pool.setMaxThreadCount(2)
+    return _capture_pool
+
+
+class _CaptureSignals(QObject):
+    captured = pyqtSignal(object, object, QImage)
+    failed = pyqtSignal(object, object)
+
+
+class _CaptureTask(QRunnable):
+    def __init__(self, backend, hwnd, stamp, size, signals):
+        super().__init__()
+        self.backend = backend
+        self.hwnd = hwnd
+        self.stamp = stamp
+        self.size = size
+        self.signals = signals
+
+    def run(self):
+        try:
+            image = self.backend.capture(self.hwnd)
+        except Exception:
+            image = None
+        if image is None or image.isNull():
+            self.signals.failed.emit(self.hwnd, self.stamp)
+            return
+        # downscale once here so the gui thread and the cache only ever see
+        # the small version
+        image = image.scaled(self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.signals.captured.emit(self.hwnd, self.stamp, image)
+
+
+class ThumbnailLoader(QObject):
+    thumbnail_ready = pyqtSignal(object, QImage)
+
+    def __init__(self, backend=None, cache=None, size=QSize(64, 40), parent=None):
+        super().__init__(parent)
+        self.backend = backend if backend is not None else default_backend()
+        self.cache = cache if cache is not None else ThumbnailCache()
+        self.size = size
+        self.pool = capture_pool()
+        self._pending = set()
+        # not a child of the loader, tasks still running after it is deleted
+        # emit into a live object whose connections are already gone
+        self._signals = _CaptureSignals()
+        self._signals.captured.connect(self._on_captured)
+        self._signals.failed.connect(self._on_failed)
+
+    def request(self, hwnd):
+        try:
+            stamp = self.backend.change_stamp(hwnd)
+        except Exception:
+            return None
+        key = (hwnd, stamp)
+        image = self.cache.get(key)
+        if image is not None:
+            return image
+        if key not in self._pending:
+            self._pending.add(key)
+            self.pool.start(_CaptureTask(self.backend, hwnd, stamp, self.size, self._signals))
+        return None
+
+    def _on_captured(self, hwnd, stamp, image):
+        self._pending.discard((hwnd, stamp))
+        self.cache.put((hwnd, stamp), image)
+        self.thumbnail_ready.emit(hwnd, image)
+
+    def _on_failed(self, hwnd, stamp):
+        self._pending.discard((hwnd, stamp))